@@ -0,0 +1,101 @@
+# batch.py
+
+"""
+Solves one part of a day for many inputs (e.g. the inputs of several users)
+on a process pool, returning the answers in the order of the inputs.
+
+    from pathlib import Path
+    from batch import solve_many
+    solve_many(21, "b", [Path("alice.txt"), Path("bob.txt"), rules_text])
+
+    python batch.py 21 b alice.txt bob.txt -j 4
+
+Inputs are either the puzzle input itself (a str) or the path of a file
+holding it (a pathlib.Path, or any os.PathLike). Identical inputs are solved
+once: users sharing a rule book (day 21) or a blueprint (day 25) share its
+parsed table and its answer. The distinct inputs are handed to the workers in
+chunks, so each worker imports the day module once for many inputs, and days
+whose 'parse_data' uses the parse cache share their parses across runs.
+"""
+
+import argparse
+import functools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from utils import get_solver
+
+def read_input(source) -> str:
+    """The puzzle input given by 'source': the text of a path, without its
+        trailing newlines, or the str itself."""
+    if isinstance(source, os.PathLike):
+        with open(source, 'r') as f:
+            return f.read().rstrip("\n")
+
+    return source.rstrip("\n")
+
+def solve_input(day, part, data, return_exceptions=False):
+    try:
+        return get_solver(day, part)(data)
+    except Exception as e:
+        if not return_exceptions:
+            raise
+        return e
+
+def solve_many(day, part, inputs, jobs=None, return_exceptions=False):
+    """Answers of the part for each of the 'inputs', in order. With
+        'return_exceptions', an input whose solver raises gets the exception
+        as its answer instead of failing the whole batch, and so does a
+        path that cannot be read."""
+    if get_solver(day, part) is None:
+        raise LookupError(f"day {day} has no part {part}")
+
+    datas = []
+    for source in inputs:
+        try:
+            datas.append(read_input(source))
+        except (OSError, UnicodeDecodeError) as e:
+            if not return_exceptions:
+                raise
+            datas.append(e)
+
+    # unreadable inputs keep their exception as their answer
+    distinct = list(dict.fromkeys(d for d in datas if isinstance(d, str)))
+    solve = functools.partial(solve_input, day, part,
+                              return_exceptions=return_exceptions)
+
+    jobs = min(jobs or os.cpu_count() or 1, len(distinct))
+    if jobs <= 1:
+        answers = list(map(solve, distinct))
+    else:
+        # a few chunks per worker, to balance inputs of uneven difficulty
+        chunksize = max(1, len(distinct) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            answers = list(pool.map(solve, distinct, chunksize=chunksize))
+
+    by_data = dict(zip(distinct, answers))
+    return [by_data[data] if isinstance(data, str) else data
+            for data in datas]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("day", type=int)
+    parser.add_argument("part", choices=("a", "b"))
+    parser.add_argument("paths", nargs="+", type=Path)
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    answers = solve_many(args.day, args.part, args.paths, args.jobs,
+                         return_exceptions=True)
+    for path, answer in zip(args.paths, answers):
+        if isinstance(answer, Exception):
+            answer = f"ERROR {answer!r}"
+        print(f"{path}\t{answer}")
+
+    return 1 if any(isinstance(a, Exception) for a in answers) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+# benchmark.py
+
+"""
+Times every day's solvers and a few hot kernels, stores the results as a JSON
+baseline and reports the benchmarks that got slower than the baseline.
+
+    python benchmark.py --save                # record a new baseline
+    python benchmark.py                       # compare against the baseline
+    python benchmark.py -k day_10 knot_hash   # only matching benchmarks
+    python benchmark.py --threshold 0.25      # tolerate 25% slowdowns
+    python benchmark.py --scaling 12.b --sizes 1000 10000 100000
+    python benchmark.py -k import.                # day module import times
+
+The --scaling mode times a part on synthetic inputs of growing size (see
+synthetic.py) and prints CSV rows of size, time and peak traced memory, ready
+to be plotted.
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+import tracemalloc
+from collections import defaultdict
+
+from utils import DAYS, PARTS, get_solver, load_day, read_input_data
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+# no day module should take longer than this to import
+IMPORT_BUDGET = 0.100
+
+# name -> (setup function, measuring function)
+BENCHMARKS = {}
+
+def benchmark(name, measurer=None):
+    """Register the decorated setup function under 'name'. The setup runs
+    untimed and returns the target passed to 'measurer(target, repeat)'; by
+    default a zero-argument callable timed by 'measure'."""
+    def register(setup):
+        BENCHMARKS[name] = (setup, measurer)
+        return setup
+
+    return register
+
+def solver_benchmark(day, part):
+    def setup():
+        solver = get_solver(day, part)
+        if solver is None:
+            raise LookupError(f"day {day} has no part {part}")
+        data = read_input_data(day)
+        return lambda: solver(data)
+
+    return setup
+
+def measure_import(module_name, repeat=5):
+    """Cumulative import time of 'module_name' in fresh interpreters, as
+        reported by 'python -X importtime', in seconds."""
+    folder = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    for _ in range(repeat):
+        stderr = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c",
+             f"import {module_name}"],
+            cwd=folder, capture_output=True, text=True, check=True).stderr
+
+        for line in stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package"
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module_name:
+                timings.append(int(fields[1]) / 10**6)
+
+    return dict(min=min(timings), median=statistics.median(timings),
+                number=1, repeat=repeat)
+
+for _day in DAYS:
+    for _part in PARTS:
+        benchmark(f"day_{_day:02d}.{_part}")(solver_benchmark(_day, _part))
+    benchmark(f"import.day_{_day:02d}", measure_import)(
+        lambda _name=f"day_{_day:02d}": _name)
+
+@benchmark("kernel.knot_hash")
+def knot_hash_setup():
+    knot_hash = load_day(10).solve_challenge_b
+    return lambda: knot_hash("flqrgnkx-0")
+
+@benchmark("kernel.redistribute")
+def redistribute_setup():
+    day_06 = load_day(6)
+    banks = day_06.parse_data(read_input_data(6))
+    max_value = max(banks)
+    max_index = banks.index(max_value)
+    return lambda: day_06.redistribute(banks, max_value, max_index)
+
+@benchmark("kernel.update_particle")
+def update_particle_setup():
+    day_20 = load_day(20)
+    particles = day_20.parse_data(read_input_data(20))
+    update_particle = day_20.update_particle
+    return lambda: [update_particle(p) for p in particles]
+
+@benchmark("kernel.execute_step")
+def execute_step_setup():
+    day_25 = load_day(25)
+
+    def run_steps(n=10000):
+        tape = dict(values=defaultdict(int), cursor=0, current_state='A')
+        for _ in range(n):
+            day_25.execute_step(tape)
+
+    return run_steps
+
+def divisible_pairs_setup(engine):
+    def setup():
+        from synthetic import generate
+
+        day_02 = load_day(2)
+        pairs_sum = getattr(day_02, engine)
+        spreadsheet = day_02.parse_data(generate(2, 4, width=2000))
+        return lambda: day_02.checksum_b(spreadsheet, pairs_sum)
+
+    return setup
+
+# day 2's pair search on synthetic rows of 2000 cells, with both engines
+benchmark("kernel.pairs.multiples")(
+    divisible_pairs_setup("divisible_pairs_sum"))
+benchmark("kernel.pairs.combinations")(
+    divisible_pairs_setup("divisible_pairs_sum_combinations"))
+
+def jumps_setup(part, size):
+    def setup():
+        from synthetic import generate
+
+        day_05 = load_day(5)
+        jump_offsets = day_05.parse_data(generate(5, size))
+        return lambda: day_05.count_steps(list(jump_offsets), part == "b")
+
+    return setup
+
+def measure_throughput(func, repeat=5):
+    """Same as 'measure', for a 'func' returning the number of steps it made;
+        adds the steps per second of the best time."""
+    result = measure(func, repeat)
+    result["per_second"] = func() / result["min"]
+    return result
+
+# day 5's jump loops on synthetic mazes of growing size, in steps per second:
+# 'jump_kernel' for part a, 'settled_kernel' for part b. The mazes are large
+# enough for the loop to outweigh copying the offsets: 3M and 32M jumps for
+# part a, 21M and 181M for part b (up to 14 s per run without numba)
+for _part, _sizes in (("a", (3000, 10000)), ("b", (1000, 2000))):
+    for _size in _sizes:
+        benchmark(f"kernel.jumps_{_part}.{_size}", measure_throughput)(
+            jumps_setup(_part, _size))
+
+def measure(func, repeat=5):
+    """Times 'func' like timeit does: the call count per measurement is
+        calibrated to last at least 0.2s (this also warms up), then 'repeat'
+        measurements are taken. Returns per-call timings, in seconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    timings = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+    return dict(min=min(timings), median=statistics.median(timings),
+                number=number, repeat=repeat)
+
+def measure_scaling(day, part, sizes, seed=2017, repeat=3):
+    """Times a part on synthetic inputs of each size; the peak memory is
+        measured in a separate, traced, run."""
+    from synthetic import generate
+
+    solver = get_solver(day, part)
+    rows = []
+    for size in sizes:
+        data = generate(day, size, seed)
+        timing = measure(lambda: solver(data), repeat)
+
+        tracemalloc.start()
+        try:
+            solver(data)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        rows.append(dict(size=size, input_chars=len(data), min=timing["min"],
+                         median=timing["median"], peak_kb=peak / 1024))
+
+    return rows
+
+def select(names, patterns):
+    if not patterns:
+        return list(names)
+
+    return [n for n in names if any(p in n for p in patterns)]
+
+def run_benchmarks(names, repeat=5, log=print):
+    results = {}
+    for name in names:
+        setup, measurer = BENCHMARKS[name]
+        try:
+            results[name] = (measurer or measure)(setup(), repeat)
+        except Exception as e:
+            log(f"{name:<28} ERROR {e!r}")
+            continue
+
+        per_second = results[name].get("per_second")
+        log(f"{name:<28} {results[name]['min']:>12.6f} s" +
+            (f" {per_second:>14,.0f} steps/s" if per_second else ""))
+
+    return results
+
+def save_baseline(results, path):
+    baseline = dict(python=platform.python_version(),
+                    machine=platform.machine(), results=results)
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+def compare(baseline, results, threshold=0.10):
+    """Returns the report lines and the names of the benchmarks whose best
+        time is more than 'threshold' (relative) above the baseline's."""
+    lines = [f"{'benchmark':<28} {'baseline s':>12} {'current s':>12} "
+             f"{'change':>8}"]
+    regressions = []
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+
+        before, after = baseline[name]["min"], results[name]["min"]
+        change = (after - before) / before if before > 0 else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+
+        lines.append(f"{name:<28} {before:>12.6f} {after:>12.6f} "
+                     f"{change:>+8.1%}{flag}")
+
+    return lines, regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", dest="patterns", nargs="*", default=[],
+                        help="only run benchmarks whose name contains one "
+                             "of these substrings")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true",
+                        help="write the results as the new baseline")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET,
+                        help="seconds a day module may take to import")
+    parser.add_argument("--scaling", metavar="DAY.PART",
+                        help="time this part on synthetic inputs instead")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10, 100, 1000])
+    parser.add_argument("--seed", type=int, default=2017)
+    args = parser.parse_args(argv)
+
+    if args.scaling:
+        day, part = args.scaling.split(".")
+        rows = measure_scaling(int(day), part, args.sizes, args.seed,
+                               args.repeat)
+        writer = csv.DictWriter(sys.stdout, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+        return 0
+
+    results = run_benchmarks(select(BENCHMARKS, args.patterns), args.repeat)
+
+    over_budget = [name for name, r in results.items()
+                   if name.startswith("import.")
+                   and r["min"] > args.import_budget]
+    for name in over_budget:
+        print(f"{name} takes {results[name]['min'] * 1000:.1f} ms to import, "
+              f"over the {args.import_budget * 1000:.0f} ms budget")
+
+    if args.save:
+        if os.path.exists(args.baseline):
+            # keep the entries of benchmarks that were not run this time
+            results = {**load_baseline(args.baseline), **results}
+        save_baseline(results, args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}, run with --save first")
+        return 1 if over_budget else 0
+
+    lines, regressions = compare(load_baseline(args.baseline), results,
+                                 args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"{len(regressions)} regression(s) above "
+              f"{args.threshold:.0%}: {', '.join(regressions)}")
+
+    return 1 if regressions or over_budget else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
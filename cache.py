@@ -0,0 +1,231 @@
+# cache.py
+
+"""
+On-disk cache of parsed puzzle inputs.
+
+A day's 'parse_data' decorated with 'cached_parse(DAY)' stores what it returns
+as a pickle, keyed by the day, a hash of the raw input and a hash of the day
+module's source (so editing the parser invalidates its entries). Later calls
+with the same input load the pickle instead of parsing again. Each call gets
+freshly unpickled objects, so solvers may keep mutating what they are given.
+
+The least recently used entries are evicted once the parsed inputs take more
+than AOC_PARSE_CACHE_MAX_BYTES (synthetic and batch inputs add up quickly).
+Set AOC_PARSE_CACHE=0 to disable it, AOC_CACHE_DIR to move it.
+
+It also holds a store of puzzle answers, keyed by the day, the part, a hash of
+the input and a hash of the solver's source (its day module plus the other
+local modules it uses), which 'utils.puzzle_a' / 'utils.puzzle_b' consult
+before solving. The least recently used answers are evicted once the store
+grows past AOC_ANSWER_CACHE_MAX_BYTES. Set AOC_ANSWER_CACHE=0 to bypass it, or
+AOC_ANSWER_CACHE=refresh to solve again and overwrite the stored answers.
+"""
+
+import functools
+import os
+import sys
+
+CACHE_FOLDER = os.environ.get(
+    "AOC_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+PARSE_CACHE_ENABLED = os.environ.get("AOC_PARSE_CACHE", "1") != "0"
+PARSE_CACHE_MAX_BYTES = int(os.environ.get("AOC_PARSE_CACHE_MAX_BYTES",
+                                           64 * 1024 * 1024))
+ANSWER_CACHE_MODE = os.environ.get("AOC_ANSWER_CACHE", "1")
+ANSWER_CACHE_MAX_BYTES = int(os.environ.get("AOC_ANSWER_CACHE_MAX_BYTES",
+                                            1024 * 1024))
+
+# inputs smaller than this parse faster than a cache lookup
+MIN_CACHED_SIZE = 1024
+
+def content_hash(*parts) -> str:
+    """Hex digest identifying the given str / bytes parts."""
+    # hashlib and pickle are imported on use, to keep day imports cheap
+    import hashlib
+
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode()
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+
+    return h.hexdigest()[:32]
+
+@functools.lru_cache(maxsize=None)
+def file_hash(path) -> str:
+    with open(path, "rb") as f:
+        return content_hash(f.read())
+
+def source_hash(func) -> str:
+    """Hash of the source file defining 'func'."""
+    return file_hash(sys.modules[func.__module__].__file__)
+
+def local_module_files(module):
+    """Source files of 'module' and of the modules of this repository whose
+        functions or submodules it uses (day_14 uses day_10's knot hash)."""
+    folder = os.path.dirname(os.path.abspath(__file__))
+    names = {module.__name__}
+    for value in vars(module).values():
+        if isinstance(value, type(module)):
+            names.add(value.__name__)
+        elif isinstance(getattr(value, "__module__", None), str):
+            names.add(value.__module__)
+
+    files = set()
+    for name in names:
+        path = getattr(sys.modules.get(name), "__file__", None)
+        if path and os.path.dirname(os.path.abspath(path)) == folder:
+            files.add(os.path.abspath(path))
+
+    return sorted(files)
+
+def solver_hash(func) -> str:
+    """Hash of the sources 'func' depends on."""
+    module = sys.modules[func.__module__]
+    return content_hash(*map(file_hash, local_module_files(module)))
+
+def read_pickle(path):
+    """The object pickled at 'path', or None when missing or unreadable
+        (a truncated file, or one referring to a class or function that no
+        longer exists, e.g. one of a '__main__' module)."""
+    import pickle
+
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except OSError:
+        return None
+    except Exception:
+        # unpickling raises about anything on bad files (AttributeError,
+        # ImportError, ValueError, ...): discard them
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        return None
+
+def write_pickle(path, obj):
+    """Atomically pickle 'obj' to 'path' (concurrent writers are safe)."""
+    import pickle
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def parsed_folder():
+    return os.path.join(CACHE_FOLDER, "parsed")
+
+def cached_parse(day, min_size=MIN_CACHED_SIZE,
+                 max_bytes=PARSE_CACHE_MAX_BYTES):
+    """Decorator caching a day's 'parse_data(data)' results on disk."""
+    def decorate(parse_data):
+        @functools.wraps(parse_data)
+        def wrapper(data):
+            if not PARSE_CACHE_ENABLED or len(data) < min_size:
+                return parse_data(data)
+
+            key = content_hash(data, source_hash(parse_data))
+            path = os.path.join(parsed_folder(),
+                                f"day_{day:02d}-{key}.pickle")
+            parsed = read_pickle(path)
+            if parsed is None:
+                parsed = parse_data(data)
+                write_pickle(path, parsed)
+                evict_lru(parsed_folder(), max_bytes)
+            else:
+                touch(path)
+
+            return parsed
+
+        return wrapper
+
+    return decorate
+
+def answers_folder():
+    return os.path.join(CACHE_FOLDER, "answers")
+
+def answer_path(day, part, data, solver):
+    key = content_hash(data, solver_hash(solver))
+    return os.path.join(answers_folder(), f"day_{day:02d}{part}-{key}.pickle")
+
+def load_answer(day, part, data, solver):
+    """(True, answer) when the store has this answer, else (False, None)."""
+    path = answer_path(day, part, data, solver)
+    entry = read_pickle(path)
+    if entry is None:
+        return False, None
+
+    touch(path)
+    return True, entry["answer"]
+
+def store_answer(day, part, data, solver, answer,
+                 max_bytes=ANSWER_CACHE_MAX_BYTES):
+    write_pickle(answer_path(day, part, data, solver), dict(answer=answer))
+    evict_answers(max_bytes)
+
+def touch(path):
+    """Marks the entry at 'path' as recently used."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass # evicted by a concurrent run
+
+def evict_answers(max_bytes=ANSWER_CACHE_MAX_BYTES):
+    """Removes the least recently used answers until the store takes at most
+        'max_bytes'. Returns the number of removed answers."""
+    return evict_lru(answers_folder(), max_bytes)
+
+def evict_lru(folder, max_bytes):
+    """Removes the least recently used pickles of 'folder' until they take
+        at most 'max_bytes'. Returns the number of removed pickles."""
+    try:
+        entries = [e for e in os.scandir(folder)
+                   if e.name.endswith(".pickle")]
+    except FileNotFoundError:
+        return 0
+
+    stats = sorted(((e.stat(), e.path) for e in entries),
+                   key=lambda x: x[0].st_mtime)
+    total = sum(st.st_size for st, _ in stats)
+
+    removed = 0
+    for st, path in stats:
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass # evicted by a concurrent run
+        total -= st.st_size
+        removed += 1
+
+    return removed
+
+def clear_answers():
+    return evict_answers(max_bytes=0)
+
+def solve_cached(day, part, solver, data, mode=None, run=None):
+    """solver(data), through the answer store. 'mode' (default: from
+        AOC_ANSWER_CACHE) is "0" to bypass the store and "refresh" to solve
+        again and overwrite the stored answer. 'run(data)', when given, is
+        called instead of the solver (e.g. to profile it)."""
+    mode = ANSWER_CACHE_MODE if mode is None else mode
+    run = run or solver
+    if mode == "0":
+        return run(data)
+
+    if mode != "refresh":
+        found, answer = load_answer(day, part, data, solver)
+        if found:
+            return answer
+
+    answer = run(data)
+    store_answer(day, part, data, solver, answer)
+    return answer
@@ -0,0 +1,95 @@
+# checkpoint.py
+
+"""
+Progress reports and resumable checkpoints for the long simulation loops
+(days 5, 15, 17, 22 and 25 run 10^7 to 5.10^7 iterations).
+
+A loop is written as 'advance(state, start, stop)', running its iterations
+from 'start' to 'stop' and returning the new state and the number of
+iterations done (less than 'stop' when the loop ended early), and is run by
+'run_checkpointed', in spans of SPAN iterations when either is enabled:
+
+    AOC_PROGRESS=1    report the iterations done, the throughput and the
+                      estimated time left to stderr every 5 seconds
+    AOC_CHECKPOINT=1  snapshot the loop state every AOC_CHECKPOINT_INTERVAL
+                      seconds (default: 30) to the cache folder; a run
+                      interrupted on the same input resumes from its last
+                      snapshot, which is removed once the loop completes
+
+Otherwise the loop runs in a single span, as if it were called directly.
+Snapshots are pickles of the state, keyed by the loop's name, its input and
+the source of its module, so editing the day discards them.
+"""
+
+import os
+import sys
+import time
+
+from cache import CACHE_FOLDER, content_hash, read_pickle, source_hash, \
+    write_pickle
+
+PROGRESS_ENABLED = os.environ.get("AOC_PROGRESS", "0") != "0"
+PROGRESS_INTERVAL = 5.0
+CHECKPOINT_ENABLED = os.environ.get("AOC_CHECKPOINT", "0") != "0"
+CHECKPOINT_INTERVAL = float(os.environ.get("AOC_CHECKPOINT_INTERVAL", 30))
+
+# iterations between two checks of the clock
+SPAN = 1 << 20
+
+def checkpoint_path(name, key, total, advance):
+    key = content_hash(name, key, str(total), source_hash(advance))
+    return os.path.join(CACHE_FOLDER, "checkpoints", f"{name}-{key}.pickle")
+
+def report_progress(name, done, total, rate, out=sys.stderr):
+    line = f"{name}: {done:,} iterations"
+    if total:
+        line += f" of {total:,} ({done / total:.1%})"
+    line += f", {rate:,.0f}/s"
+    if total and rate > 0:
+        line += f", {(total - done) / rate:.0f} s left"
+    print(line, file=out, flush=True)
+
+def run_checkpointed(name, key, state, advance, total=None, span=None,
+                     progress=None, checkpoint=None):
+    """Runs 'advance' from 'state' until it ends early or reaches 'total'
+        iterations (none for loops ending by themselves), with the progress
+        reports and checkpoints enabled by the environment (or by
+        'progress' / 'checkpoint'). 'key' (str or bytes) identifies the
+        loop's input. Returns the final state and the number of iterations
+        done."""
+    progress = PROGRESS_ENABLED if progress is None else progress
+    checkpoint = CHECKPOINT_ENABLED if checkpoint is None else checkpoint
+    end = sys.maxsize if total is None else total
+    span = span or SPAN
+    if not progress and not checkpoint:
+        return advance(state, 0, end)
+
+    path = checkpoint_path(name, key, total, advance) if checkpoint else None
+    done = 0
+    snapshot = read_pickle(path) if checkpoint else None
+    if snapshot is not None:
+        done, state = snapshot
+        if progress:
+            print(f"{name}: resuming after {done:,} iterations",
+                  file=sys.stderr)
+
+    start_time = last_save = last_report = time.perf_counter()
+    resumed_at = done
+    while done < end:
+        stop = min(done + span, end)
+        state, done = advance(state, done, stop)
+        if done < stop:
+            break
+
+        now = time.perf_counter()
+        if checkpoint and now - last_save >= CHECKPOINT_INTERVAL:
+            write_pickle(path, (done, state))
+            last_save = now
+        if progress and now - last_report >= PROGRESS_INTERVAL:
+            report_progress(name, done, total,
+                            (done - resumed_at) / (now - start_time))
+            last_report = now
+
+    if checkpoint and os.path.exists(path):
+        os.unlink(path)
+    return state, done
@@ -19,14 +19,50 @@ For example:
         last digit, 9.
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
+from utils import optional_module, iter_chunks, CHUNK_SIZE
+from cache import cached_parse
+import os
 DAY = 1
 
+# inputs at least this long are solved with numpy, when it is installed
+NUMPY_MIN_SIZE = 4096
+ZERO = ord('0')
+
+@cached_parse(DAY)
 def parse_data(data):
     data = [int(i) for i in data]
     return data
 
+def digits_array(data):
+    """The digits of 'data' (str, bytes or a buffer of ASCII digits) as a
+        numpy uint8 array, read straight from the bytes."""
+    np = optional_module("numpy")
+    if isinstance(data, str):
+        data = data.encode("ascii")
+    digits = np.frombuffer(data, dtype=np.uint8) - ZERO
+    if len(digits) and digits.max() > 9:
+        raise ValueError("the captcha must only hold digits")
+
+    return digits
+
+def captcha_sum_numpy(digits, k):
+    """Sum of the digits matching the digit 'k' places ahead in the circular
+        sequence, over a numpy array of digits; compares views of the array,
+        without copying it."""
+    np = optional_module("numpy")
+    n = len(digits)
+    head, tail = digits[:n - k], digits[n - k:]
+    return int(np.sum(head, where=head == digits[k:], dtype=np.int64) +
+               np.sum(tail, where=tail == digits[:k], dtype=np.int64))
+
+def use_numpy(data):
+    return len(data) >= NUMPY_MIN_SIZE and optional_module("numpy") is not None
+
 def solve_challenge_a(data):
+    if use_numpy(data):
+        return captcha_sum_numpy(digits_array(data), 1)
+
     data = parse_data(data)
 
     shifted = [data[-1]] + data[:-1]
@@ -36,10 +72,51 @@ def solve_challenge_a(data):
     rv = sum(matching)
     return rv
 
-assert solve_challenge_a('1122') == 3
-assert solve_challenge_a('1111') == 4
-assert solve_challenge_a('1234') == 0
-assert solve_challenge_a('91212129') == 9
+def matching_sum(first, second):
+    """Sum of the digits equal at the same position in two same-length
+        buffers of ASCII digits (bytes, or memoryviews to avoid copies)."""
+    if use_numpy(first):
+        np = optional_module("numpy")
+        first, second = digits_array(first), digits_array(second)
+        return int(np.sum(first, where=first == second, dtype=np.int64))
+
+    return sum(x - ZERO for x, y in zip(first, second) if x == y)
+
+def solve_chunks_a(chunks):
+    """Same as 'solve_challenge_a', over a stream of text chunks (see
+        utils.iter_chunks); only the first and previous digits are kept."""
+    first = previous = None
+    rv = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+
+        chunk = memoryview(chunk.encode("ascii"))
+        if chunk[0] == previous:
+            rv += previous - ZERO
+        rv += matching_sum(chunk[:-1], chunk[1:])
+
+        if first is None:
+            first = chunk[0]
+        previous = chunk[-1]
+
+    if first is not None and previous == first:
+        rv += first - ZERO
+    return rv
+
+def solve_file_a(path):
+    """'solve_chunks_a' on a file, read in chunks of constant size."""
+    return solve_chunks_a(iter_chunks(path))
+
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a('1122') == 3
+    assert solve_challenge_a('1111') == 4
+    assert solve_challenge_a('1234') == 0
+    assert solve_challenge_a('91212129') == 9
+    assert solve_chunks_a(['9121', '2', '129']) == 9
+    if optional_module("numpy"):
+        assert captcha_sum_numpy(digits_array('91212129'), 1) == 9
 
 """
 Now, instead of considering the next digit, it wants you to consider the digit
@@ -59,6 +136,10 @@ For example:
 """
 
 def solve_challenge_b(data):
+    if use_numpy(data):
+        assert len(data) % 2 == 0
+        return captcha_sum_numpy(digits_array(data), len(data) // 2)
+
     data = parse_data(data)
     assert len(data) % 2 == 0
 
@@ -70,11 +151,106 @@ def solve_challenge_b(data):
     rv = sum(matching)
     return rv
 
-assert solve_challenge_b('1212') == 6
-assert solve_challenge_b('1221') == 0
-assert solve_challenge_b('123425') == 4
-assert solve_challenge_b('123123') == 12
-assert solve_challenge_b('12131415') == 4
+def solve_file_b(path, chunk_size=CHUNK_SIZE):
+    """Same as 'solve_challenge_b', on a file read by two cursors, at its
+        start and at its middle, a chunk at a time: a digit matching the one
+        halfway around is matched back by it, so the sum over the first half
+        is half of the answer. Chunks are read with os.pread rather than from
+        a memory map, whose pages would add up to the whole file in the RSS."""
+    with open(path, 'rb') as f:
+        fd = f.fileno()
+        n = os.fstat(fd).st_size
+        while n > 0 and os.pread(fd, 1, n - 1) == b"\n":
+            n -= 1
+        assert n % 2 == 0
+
+        half = n // 2
+        rv = 0
+        for start in range(0, half, chunk_size):
+            size = min(chunk_size, half - start)
+            rv += matching_sum(os.pread(fd, size, start),
+                               os.pread(fd, size, half + start))
+
+    return 2 * rv
+
+# below this many offsets, comparing the digits once per offset is cheaper
+# than the FFT's nine transforms
+FFT_MIN_OFFSETS = 32
+
+def captcha_sums(data, offsets):
+    """The captcha sum for each of the 'offsets' (the sum of the digits
+        matching the digit k places ahead, circularly; part a is k = 1 and
+        part b k = n/2), in order, for many offsets at once.
+
+        With numpy, the sums of all offsets are the circular autocorrelation
+        of the per-digit indicator arrays, weighted by the digits, computed
+        in one pass with FFTs. Without it, many offsets are answered by
+        counting, for each digit, the distances between its positions."""
+    n = len(data)
+    offsets = [k % n for k in offsets]
+    if use_numpy(data):
+        digits = digits_array(data)
+        if len(offsets) < FFT_MIN_OFFSETS:
+            return [captcha_sum_numpy(digits, k) for k in offsets]
+        return captcha_sums_fft(digits, offsets)
+
+    digits = parse_data(data)
+    if len(offsets) * 10 < n:
+        return [sum(d for d, e in zip(digits, digits[k:] + digits[:k])
+                    if d == e)
+                for k in offsets]
+
+    positions = [[] for _ in range(10)]
+    for i, d in enumerate(digits):
+        positions[d].append(i)
+
+    sums = [0] * n
+    for d in range(1, 10):
+        for i in positions[d]:
+            for j in positions[d]:
+                sums[(j - i) % n] += d
+
+    return [sums[k] for k in offsets]
+
+def captcha_sums_fft(digits, offsets):
+    np = optional_module("numpy")
+    n = len(digits)
+    power = np.zeros(n // 2 + 1)
+    for d in range(1, 10):
+        spectrum = np.fft.rfft(digits == d)
+        power += d * (spectrum.real ** 2 + spectrum.imag ** 2)
+
+    sums = np.rint(np.fft.irfft(power, n)).astype(np.int64)
+    return [int(sums[k]) for k in offsets]
+
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b('1212') == 6
+    assert solve_challenge_b('1221') == 0
+    assert solve_challenge_b('123425') == 4
+    assert solve_challenge_b('123123') == 12
+    assert solve_challenge_b('12131415') == 4
+    if optional_module("numpy"):
+        assert captcha_sum_numpy(digits_array(b'123425'), 3) == 4
+
+    assert captcha_sums('123425', [3, 1, 0, -3]) == [4, 0, 17, 4]
+    assert captcha_sums('1212', range(8)) == [6, 0, 6, 0] * 2
+
+    if optional_module("numpy"):
+        # large enough, and with enough offsets, for the FFT
+        from synthetic import generate
+        data = generate(DAY, 5000)
+        offsets = list(range(0, len(data), 97)) + [-1, -2500, 7001]
+        assert use_numpy(data) and len(offsets) >= FFT_MIN_OFFSETS
+        digits = digits_array(data)
+        assert captcha_sums(data, offsets) == \
+            [captcha_sum_numpy(digits, k % len(data)) for k in offsets]
+
+    import tempfile
+    with tempfile.NamedTemporaryFile("w", suffix=".txt") as f:
+        f.write("12131415\n")
+        f.flush()
+        assert solve_file_b(f.name, chunk_size=3) == 4
 
 if __name__ == "__main__":
     puzzle_a(DAY, solve_challenge_a)
@@ -22,25 +22,92 @@ For example, given the following spreadsheet:
 In this example, the spreadsheet's checksum would be 8 + 4 + 6 = 18.
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
+from utils import optional_module
+import warnings
 DAY = 2
 
+# spreadsheets at least this long are parsed with numpy, when it is installed
+NUMPY_MIN_SIZE = 4096
+
+def parse_lines(lines):
+    """Lazily parses the rows of a spreadsheet given as lines."""
+    return ([int(i) for i in line.split()] for line in lines)
+
 def parse_data(data):
-    spreadsheet = [line.split() for line in data.split("\n")]
-    spreadsheet = [[int(i) for i in row] for row in spreadsheet]
+    spreadsheet = list(parse_lines(data.split("\n")))
 
     return spreadsheet
 
-def solve_challenge_a(data):
-    spreadsheet = parse_data(data)
-
-    diffs = [max(row) - min(row) for row in spreadsheet]
+def parse_array(data):
+    """The whole spreadsheet as a numpy array of its cells, row after row,
+        and the offsets of the rows in it (a ragged array; rows may have
+        any width). Parsed in a handful of vectorized passes over the text."""
+    np = optional_module("numpy")
+    with warnings.catch_warnings():
+        # numpy 1.x warns, and stops, on unparsable text, numpy 2 raises
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            cells = np.fromstring(data, dtype=np.int64, sep=" ")
+        except (DeprecationWarning, ValueError):
+            raise ValueError("the spreadsheet must only hold integers")
+
+    text = np.frombuffer(data.encode("ascii"), dtype=np.uint8)
+    space = (text == ord(" ")) | (text == ord("\t")) | (text == ord("\n"))
+    starts = np.flatnonzero(~space & np.concatenate(([True], space[:-1])))
+    rows = np.cumsum(text == ord("\n"))[starts]
+    offsets = np.flatnonzero(np.diff(rows, prepend=-1))
+
+    return cells, offsets
+
+def use_numpy(data):
+    return len(data) >= NUMPY_MIN_SIZE and optional_module("numpy") is not None
+
+def checksum_a_numpy(cells, offsets):
+    """Raises OverflowError when the checksum may not fit in an int64, or
+        when cells were clamped to its range by 'parse_array'."""
+    np = optional_module("numpy")
+    limit = np.iinfo(np.int64).max // (2 * max(1, len(offsets)))
+    if len(cells) and (cells.min() < -limit or cells.max() > limit):
+        raise OverflowError("the cells are too large for int64 arithmetic")
+
+    ranges = (np.maximum.reduceat(cells, offsets) -
+              np.minimum.reduceat(cells, offsets))
+    return int(ranges.sum())
+
+def checksum_a(spreadsheet):
+    # empty rows have no range, as in the numpy checksum
+    diffs = (max(row) - min(row) for row in spreadsheet if row)
 
     rv = sum(diffs)
     return rv
 
+def solve_challenge_a(data):
+    if use_numpy(data):
+        try:
+            return checksum_a_numpy(*parse_array(data))
+        except OverflowError:
+            pass # the list path handles integers of any size
+
+    spreadsheet = parse_data(data)
+    return checksum_a(spreadsheet)
+
+def solve_lines_a(lines):
+    """Same as 'solve_challenge_a', one row in memory at a time."""
+    return checksum_a(parse_lines(lines))
+
 test_data = "5 1 9 5\n7 5 3\n2 4 6 8"""
-assert solve_challenge_a(test_data) == 18
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a(test_data) == 18
+    assert solve_lines_a(iter(test_data.split("\n"))) == 18
+    if optional_module("numpy"):
+        assert checksum_a_numpy(*parse_array(test_data)) == 18
+
+    # large spreadsheets with cells past int64, and empty rows
+    big = "\n".join(["5 1 9 5", "", "99999999999999999999 1"] * 500)
+    assert solve_challenge_a(big) == 500 * (8 + 99999999999999999998)
+    assert solve_challenge_a("5 1 9 5\n\n7 5 3") == 12
 
 
 """
@@ -63,25 +130,79 @@ For example, given the following spreadsheet:
 In this example, the sum of the results would be 4 + 3 + 2 = 9.
 """
 
+from bisect import bisect_right
+from collections import Counter
 from itertools import combinations
 
-def solve_challenge_b(data):
-    spreadsheet = parse_data(data)
+def divisible_pairs_sum_combinations(row):
+    """Sum of a // b over the pairs of cells where b divides a, trying all
+        the pairs: O(w^2) for a row of width w."""
+    s = 0
+    for a, b in combinations(row, 2):
+        if a < b:
+            a, b = b, a
+
+        if a % b == 0:
+            s += a // b
 
+    return s
+
+def divisible_pairs_sum(row):
+    """Same as 'divisible_pairs_sum_combinations', probing the multiples of
+        each distinct value in a hash set, from the smallest value up. A
+        value with more multiples below the largest one than there are
+        values checks the larger values instead, so each value costs at most
+        O(w), and usually far less (rows of distinct values spread over a
+        range comparable to their width are near-linear)."""
+    if not row:
+        return 0
+
+    counts = Counter(row)
+    values = sorted(counts)
+    if values[0] <= 0:
+        return divisible_pairs_sum_combinations(row)
+
+    largest = values[-1]
     s = 0
-    for row in spreadsheet:
-        comb_pairs = combinations(row, 2)
-        for a, b in comb_pairs:
-            if a < b:
-                a, b = b, a
+    for v in values:
+        count = counts[v]
+        # equal cells divide each other
+        s += count * (count - 1) // 2
+
+        if largest // v <= len(values):
+            multiples = range(2 * v, largest + 1, v)
+        else:
+            multiples = (m for m in values[bisect_right(values, v):]
+                         if m % v == 0)
 
-            if a % b == 0:
-                s += a // b
+        for m in multiples:
+            if m in counts:
+                s += (m // v) * count * counts[m]
 
     return s
 
+def checksum_b(spreadsheet, pairs_sum=divisible_pairs_sum):
+    return sum(map(pairs_sum, spreadsheet))
+
+def solve_challenge_b(data):
+    spreadsheet = parse_data(data)
+    return checksum_b(spreadsheet)
+
+def solve_lines_b(lines):
+    """Same as 'solve_challenge_b', one row in memory at a time."""
+    return checksum_b(parse_lines(lines))
+
 test_data = "5 9 2 8\n9 4 7 3\n3 8 6 5"""
-assert solve_challenge_b(test_data) == 9
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b(test_data) == 9
+    assert solve_lines_b(iter(test_data.split("\n"))) == 9
+    spreadsheet = parse_data(test_data)
+    assert checksum_b(spreadsheet, divisible_pairs_sum_combinations) == 9
+    assert divisible_pairs_sum([4, 2, 2, 1, 12]) == \
+        divisible_pairs_sum_combinations([4, 2, 2, 1, 12])
+    assert divisible_pairs_sum([]) == 0
+    assert solve_challenge_b("1 2\n\n3 6") == 4
 
 if __name__ == "__main__":
     puzzle_a(DAY, solve_challenge_a)
@@ -28,8 +28,11 @@ How many steps are required to carry the data from the square identified in
 your puzzle input all the way to the access port?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
-from itertools import cycle
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
+from utils import optional_module
+from bisect import bisect_right
+from itertools import cycle, islice
+from math import isqrt
 
 DAY = 3
 
@@ -77,22 +80,84 @@ def points_generator():
 
             yield current_nr, current_point
 
-def solve_challenge_a(data):
-    input_nr = parse_data(data)
-
-    points = points_generator()
-
-    nr, point = next(points)
-    while nr < input_nr:
-        nr, point = next(points)
-
+def spiral_point(nr):
+    """The (x, y) of square 'nr', in O(1). Ring r > 0 holds the squares
+        after (2r - 1)^2 up to (2r + 1)^2, in four sides of 2r squares: up
+        the right, left along the top, down the left and right along the
+        bottom."""
+    if nr == 1:
+        return 0, 0
+
+    ring = (isqrt(nr - 1) + 1) // 2
+    side, pos = divmod(nr - (2 * ring - 1) ** 2 - 1, 2 * ring)
+    if side == 0:
+        return ring, pos - ring + 1
+    elif side == 1:
+        return ring - 1 - pos, ring
+    elif side == 2:
+        return -ring, ring - 1 - pos
+    else:
+        return pos - ring + 1, -ring
+
+def spiral_nr(point):
+    """The square at 'point', the inverse of 'spiral_point'."""
     x, y = point
+    ring = max(abs(x), abs(y))
+    if ring == 0:
+        return 1
+
+    if x == ring and y > -ring:
+        side, pos = 0, y + ring - 1
+    elif y == ring:
+        side, pos = 1, ring - 1 - x
+    elif x == -ring:
+        side, pos = 2, ring - 1 - y
+    else:
+        side, pos = 3, x + ring - 1
+
+    return (2 * ring - 1) ** 2 + 1 + side * 2 * ring + pos
+
+def spiral_points(nrs):
+    """The x and y coordinates of many squares, as two numpy int64 arrays
+        computed with vectorized 'spiral_point' arithmetic (as lists without
+        numpy)."""
+    np = optional_module("numpy")
+    if np is None:
+        xs, ys = zip(*map(spiral_point, nrs)) if len(nrs) else ((), ())
+        return list(xs), list(ys)
+
+    nrs = np.asarray(nrs, dtype=np.int64)
+    m = np.maximum(nrs - 1, 0)
+    # float square roots are off by one for large squares: fix them up
+    root = np.floor(np.sqrt(m)).astype(np.int64)
+    root -= root * root > m
+    root += (root + 1) * (root + 1) <= m
+
+    # square 1 is computed as square 2, then moved back to the origin
+    ring = np.maximum((root + 1) // 2, 1)
+    side, pos = np.divmod(np.maximum(m - (2 * ring - 1) ** 2, 0), 2 * ring)
+    xs = np.choose(side, [ring, ring - 1 - pos, -ring, pos - ring + 1])
+    ys = np.choose(side, [pos - ring + 1, ring, ring - 1 - pos, -ring])
+    xs[nrs == 1] = ys[nrs == 1] = 0
+
+    return xs, ys
+
+def solve_challenge_a(data):
+    x, y = spiral_point(parse_data(data))
     return abs(x) + abs(y)
 
-assert solve_challenge_a("1") == 0
-assert solve_challenge_a("12") == 3
-assert solve_challenge_a("23") == 2
-assert solve_challenge_a("1024") == 31
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a("1") == 0
+    assert solve_challenge_a("12") == 3
+    assert solve_challenge_a("23") == 2
+    assert solve_challenge_a("1024") == 31
+
+    nrs = range(1, 2000)
+    points = [point for _, point in islice(points_generator(), len(nrs))]
+    assert list(map(spiral_point, nrs)) == points
+    assert list(map(spiral_nr, points)) == list(nrs)
+    assert list(zip(*spiral_points(nrs))) == points
 
 """
 As a stress test on the system, the programs here clear the grid and then store
@@ -157,21 +222,55 @@ def points_sum_generator():
             points_dict[current_point] = current_nr
             yield current_nr, current_point
 
+def spiral_sums(nr_rings):
+    """The values written in the squares of the first 'nr_rings' rings, in
+        order. The squares are written in a grid preallocated for these
+        rings, with a margin of one square so that neighbors need no bound
+        checks."""
+    size = 2 * nr_rings + 3
+    center = nr_rings + 1
+    grid = [[0] * size for _ in range(size)]
+    grid[center][center] = 1
+
+    values = [1]
+    for nr in range(2, (2 * nr_rings + 1) ** 2 + 1):
+        x, y = spiral_point(nr)
+        r, c = center + y, center + x
+        above, row, below = grid[r + 1], grid[r], grid[r - 1]
+        value = (above[c - 1] + above[c] + above[c + 1] + row[c - 1] +
+                 row[c + 1] + below[c - 1] + below[c] + below[c + 1])
+        row[c] = value
+        values.append(value)
+
+    return values
+
+# the values written so far, a non-decreasing sequence; see 'written_values'
+WRITTEN_VALUES = []
+
+def written_values(threshold):
+    """The cached table of written values, first extended (doubling the
+        rings it covers) until it holds a value larger than 'threshold'."""
+    while not WRITTEN_VALUES or WRITTEN_VALUES[-1] <= threshold:
+        nr_rings = (isqrt(len(WRITTEN_VALUES)) - 1) // 2
+        WRITTEN_VALUES[:] = spiral_sums(max(4, 2 * nr_rings))
+
+    return WRITTEN_VALUES
+
 def solve_challenge_b(data):
     input_nr = parse_data(data)
 
-    points = points_sum_generator()
-
-    nr, _ = next(points)
-    while nr <= input_nr:
-        nr, _ = next(points)
+    values = written_values(input_nr)
+    return values[bisect_right(values, input_nr)]
 
-    return nr
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b("1") == 2
+    assert solve_challenge_b("2") == 4
+    assert solve_challenge_b("4") == 5
+    assert solve_challenge_b("5") == 10
 
-assert solve_challenge_b("1") == 2
-assert solve_challenge_b("2") == 4
-assert solve_challenge_b("4") == 5
-assert solve_challenge_b("5") == 10
+    values = [nr for nr, _ in islice(points_sum_generator(), 45 ** 2)]
+    assert spiral_sums(22) == values
 
 if __name__ == "__main__":
     puzzle_a(DAY, solve_challenge_a)
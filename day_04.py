@@ -17,24 +17,57 @@ The system's full passphrase list is available as your puzzle input. How many
 passphrases are valid?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
+from utils import byte_ranges, iter_range_lines, iter_lines, iter_chunks
+from math import prod
+import os
 
 DAY = 4
 
+def parse_lines(lines):
+    """Lazily splits each line in its words."""
+    return (line.split() for line in lines)
+
 def parse_data(data):
     lines = data.split("\n")
-    return [line.split() for line in lines]
+    return list(parse_lines(lines))
+
+def count_valid(passphrases, is_valid):
+    return sum(1 for p in passphrases if is_valid(p))
 
 def is_valid_a(passphrase):
     return len(passphrase) == len(set(passphrase))
 
 def solve_challenge_a(data):
     passphrases = parse_data(data)
-    return len([p for p in passphrases if is_valid_a(p)])
-
-assert is_valid_a(["aa", "bb", "cc", "dd", "ee"]) == True
-assert is_valid_a(["aa", "bb", "cc", "dd", "aa"]) == False
-assert is_valid_a(["aa", "bb", "cc", "dd", "aaa"]) == True
+    return count_valid(passphrases, is_valid_a)
+
+def solve_lines_a(lines):
+    """Same as 'solve_challenge_a', one passphrase in memory at a time."""
+    return count_valid(parse_lines(lines), is_valid_a)
+
+@self_test(DAY, "a")
+def test_is_valid_a():
+    assert is_valid_a(["aa", "bb", "cc", "dd", "ee"]) == True
+    assert is_valid_a(["aa", "bb", "cc", "dd", "aa"]) == False
+    assert is_valid_a(["aa", "bb", "cc", "dd", "aaa"]) == True
+
+@self_test(DAY, "a")
+def test_solve_lines():
+    import tempfile
+
+    data = "aa bb\n\naa aa\nabc cba\n\n\nx y z"
+    assert solve_lines_a(iter(data.split("\n"))) == solve_challenge_a(data)
+    assert solve_lines_b(iter(data.split("\n"))) == solve_challenge_b(data)
+    with tempfile.NamedTemporaryFile("w", suffix=".txt") as f:
+        f.write(data + "\n\n\n")
+        f.flush()
+
+        # the readers drop the trailing empty lines, not the embedded ones
+        assert list(iter_lines(f.name)) == data.split("\n")
+        assert solve_lines_b(iter_lines(f.name)) == solve_challenge_b(data)
+        for size in (1, 2, 5, 64):
+            assert "".join(iter_chunks(f.name, size)) == data
 
 """
 For added security, yet another system policy has been put in place. Now, a
@@ -56,19 +89,93 @@ For example:
 Under this new system policy, how many passphrases are valid?
 """
 
+# a prime per letter: two words are anagrams when their products are equal
+LETTER_PRIMES = dict(zip("abcdefghijklmnopqrstuvwxyz",
+                         [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43,
+                          47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97, 101]))
+
+def anagram_key(word):
+    """A key shared by the anagrams of 'word' only: the product of its
+        letters' primes, faster than sorting its letters (which words that
+        are not all lowercase letters fall back to)."""
+    try:
+        return prod(map(LETTER_PRIMES.__getitem__, word))
+    except KeyError:
+        return "".join(sorted(word))
+
 def is_valid_b(passphrase):
-    passphrase = ["".join(sorted(word)) for word in passphrase]
+    passphrase = [anagram_key(word) for word in passphrase]
     return len(passphrase) == len(set(passphrase))
 
 def solve_challenge_b(data):
     passphrases = parse_data(data)
-    return len([p for p in passphrases if is_valid_b(p)])
-
-assert is_valid_b(["abcde", "fghij"]) == True
-assert is_valid_b(["abcde", "xyz", "ecdab"]) == False
-assert is_valid_b(["a", "ab", "abc", "abd", "abf", "abj"]) == True
-assert is_valid_b(["iiii", "oiii", "ooii", "oooo"]) == True
-assert is_valid_b(["oiii", "ioii", "iioi", "iiio"]) == False
+    return count_valid(passphrases, is_valid_b)
+
+def solve_lines_b(lines):
+    """Same as 'solve_challenge_b', one passphrase in memory at a time."""
+    return count_valid(parse_lines(lines), is_valid_b)
+
+def count_valid_range(path, start, end, is_valid):
+    return count_valid(parse_lines(iter_range_lines(path, start, end)),
+                       is_valid)
+
+def count_valid_file(path, is_valid, jobs=None):
+    """Number of valid passphrases in a file, split in byte ranges which are
+        streamed line by line on a pool of 'jobs' processes."""
+    jobs = jobs or os.cpu_count() or 1
+    # a few ranges per worker, to balance them
+    ranges = byte_ranges(path, 4 * jobs)
+    if jobs == 1:
+        return sum(count_valid_range(path, start, end, is_valid)
+                   for start, end in ranges)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(count_valid_range, path, start, end, is_valid)
+                   for start, end in ranges]
+        return sum(future.result() for future in futures)
+
+def solve_file_a(path, jobs=None):
+    """Same as 'solve_challenge_a', on a file read in parallel."""
+    return count_valid_file(path, is_valid_a, jobs)
+
+def solve_file_b(path, jobs=None):
+    """Same as 'solve_challenge_b', on a file read in parallel."""
+    return count_valid_file(path, is_valid_b, jobs)
+
+@self_test(DAY, "b")
+def test_is_valid_b():
+    assert is_valid_b(["abcde", "fghij"]) == True
+    assert is_valid_b(["abcde", "xyz", "ecdab"]) == False
+    assert is_valid_b(["a", "ab", "abc", "abd", "abf", "abj"]) == True
+    assert is_valid_b(["iiii", "oiii", "ooii", "oooo"]) == True
+    assert is_valid_b(["oiii", "ioii", "iioi", "iiio"]) == False
+    assert is_valid_b(["ab", "BA", "Ab", "bA"]) == False
+
+@self_test(DAY, "b")
+def test_solve_file():
+    import tempfile
+
+    # blank lines, long and short lines, trailing newlines
+    data = "\n".join(["aa bb cc", "", "abc bca", "x", "", "",
+                      "oiii ioii iioi iiio abcdefghijklmnop q", "a b a",
+                      "ab ba"] * 3)
+    with tempfile.NamedTemporaryFile("w", suffix=".txt") as f:
+        f.write(data + "\n\n")
+        f.flush()
+
+        # the ranges split the lines between them, whatever their number
+        for nr_ranges in (1, 2, 3, 7, 40, 1000):
+            ranges = byte_ranges(f.name, nr_ranges)
+            assert len(ranges) <= nr_ranges
+            assert [line for start, end in ranges
+                    for line in iter_range_lines(f.name, start, end)] == \
+                data.split("\n")
+
+        for jobs in (1, 2):
+            assert solve_file_a(f.name, jobs) == solve_challenge_a(data)
+            assert solve_file_b(f.name, jobs) == solve_challenge_b(data)
 
 if __name__ == "__main__":
     puzzle_a(DAY, solve_challenge_a)
@@ -46,10 +46,14 @@ cycles must be completed before a configuration is produced that has been seen
 before?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
 
 DAY = 6
 
+# states kept by the "auto" cycle finder before it switches to Brent's
+# algorithm (a state of 16 banks takes about 250 bytes with its dict entry)
+HISTORY_LIMIT = 10**6
+
 def parse_data(data):
     data = data.split()
     return [int(i) for i in data]
@@ -58,37 +62,108 @@ def redistribute(current_state, max_value, max_index):
     state = list(current_state)
     state[max_index] = 0
 
-    ix = (max_index + 1) % len(state)
-    while max_value > 0:
-        state[ix] += 1
-        max_value -= 1
-        ix = (ix + 1) % len(state)
+    # every bank gets the same share of full rounds, the banks following
+    # 'max_index' one more block each for the remainder
+    rounds, rest = divmod(max_value, len(state))
+    if rounds:
+        state = [blocks + rounds for blocks in state]
+    for ix in range(max_index + 1, max_index + 1 + rest):
+        state[ix % len(state)] += 1
 
     return state
 
-def get_final_state(initial_state):
-    memory_banks = list(initial_state)
-    state_history = []
+def next_state(memory_banks):
+    """The banks after one reallocation cycle, as a tuple."""
+    max_value = max(memory_banks)
+    max_index = memory_banks.index(max_value)
+    return tuple(redistribute(memory_banks, max_value, max_index))
 
-    steps = 0
-    while memory_banks not in state_history:
-        max_value = max(memory_banks)
-        max_index = memory_banks.index(max_value)
+def get_final_state(initial_state, max_states=None):
+    """Runs the reallocation until a state repeats. Returns the number of
+        cycles, the repeated state and the step each state was first seen
+        at, keyed by the state as a tuple; or None once more than
+        'max_states' states were seen."""
+    memory_banks = tuple(initial_state)
+    first_seen = {}
 
-        state_history.append(memory_banks)
-        memory_banks = redistribute(memory_banks, max_value, max_index)
+    steps = 0
+    while memory_banks not in first_seen:
+        if max_states is not None and steps >= max_states:
+            return None
+        first_seen[memory_banks] = steps
+        memory_banks = next_state(memory_banks)
         steps += 1
 
-    return steps, memory_banks, state_history
+    return steps, memory_banks, first_seen
+
+def find_cycle_brent(initial_state):
+    """Same as 'find_cycle', keeping two states at a time (Brent's cycle
+        detection): about three times the reallocations, in constant
+        memory."""
+    # find the loop size: the tortoise waits at powers of two for the hare
+    power = loop_size = 1
+    tortoise = tuple(initial_state)
+    hare = next_state(tortoise)
+    while tortoise != hare:
+        if power == loop_size:
+            tortoise = hare
+            power *= 2
+            loop_size = 0
+        hare = next_state(hare)
+        loop_size += 1
+
+    # with the hare a loop ahead, both meet where the loop starts
+    tortoise = hare = tuple(initial_state)
+    for _ in range(loop_size):
+        hare = next_state(hare)
+
+    loop_start = 0
+    while tortoise != hare:
+        tortoise = next_state(tortoise)
+        hare = next_state(hare)
+        loop_start += 1
+
+    return loop_start + loop_size, loop_size
+
+def find_cycle(initial_state, method="auto"):
+    """The number of cycles before a state repeats (part A) and the length
+        of the loop it repeats in (part B), from a single run. 'method' is
+        "history" (every state seen is kept, the fastest), "brent" (constant
+        memory, see 'find_cycle_brent') or "auto": the history, unless it
+        grows past HISTORY_LIMIT states, then Brent's algorithm."""
+    if method not in ("auto", "history", "brent"):
+        raise ValueError(f"unknown cycle finding method {method!r}")
+
+    if method != "brent":
+        limit = HISTORY_LIMIT if method == "auto" else None
+        found = get_final_state(initial_state, limit)
+        if found is not None:
+            nr_steps, final_state, first_seen = found
+            return nr_steps, nr_steps - first_seen[final_state]
+
+    return find_cycle_brent(initial_state)
+
+def solve_challenge_a(data, method="auto"):
+    nr_steps, loop_size = find_cycle(parse_data(data), method)
+    return nr_steps
 
-def solve_challenge_a(data):
-    memory_banks = parse_data(data)
-    nr_steps, final_state, state_history = get_final_state(memory_banks)
 
-    return nr_steps
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a("0\t2\t7\t0") == 5
 
+@self_test(DAY, "a")
+def test_long_cycles():
+    from synthetic import generate
 
-assert solve_challenge_a("0\t2\t7\t0") == 5
+    # (banks, blocks per bank) -> (cycles before a repeat, loop size)
+    for (size, max_blocks), expected in {(32, 100): (845, 544),
+                                         (48, 100): (1711, 1200),
+                                         (64, 1000): (3037, 2112),
+                                         (64, 100): (21664, 19584)}.items():
+        banks = parse_data(generate(DAY, size, max_blocks=max_blocks))
+        assert find_cycle(banks) == expected
+        assert find_cycle(banks, "brent") == expected
 
 """
 Out of curiosity, the debugger would also like to know the size of the loop:
@@ -102,13 +177,15 @@ How many cycles are in the infinite loop that arises from the configuration in
 your puzzle input?
 """
 
-def solve_challenge_b(data):
-    memory_banks = parse_data(data)
-    nr_steps, final_state, state_history = get_final_state(memory_banks)
-
-    return nr_steps - state_history.index(final_state)
+def solve_challenge_b(data, method="auto"):
+    nr_steps, loop_size = find_cycle(parse_data(data), method)
+    return loop_size
 
-assert solve_challenge_b("0\t2\t7\t0") == 4
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b("0\t2\t7\t0") == 4
+    assert solve_challenge_b("0\t2\t7\t0", method="brent") == 4
+    assert get_final_state([0, 2, 7, 0], max_states=4) is None
 
 if __name__ == "__main__":
     puzzle_a(DAY, solve_challenge_a)
@@ -67,12 +67,13 @@ Before you're ready to help them, you need to make sure your information is
 correct. What is the name of the bottom program?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
-from anytree import Node, RenderTree
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
+from cache import cached_parse
 from collections import Counter
 
 DAY = 7
 
+@cached_parse(DAY)
 def parse_data(data):
     lines = data.split("\n")
 
@@ -89,7 +90,54 @@ def parse_data(data):
 
     return nodes
 
+class SimpleNode:
+    """The part of anytree's Node used here, for when anytree is missing."""
+
+    def __init__(self, name, **attributes):
+        self.name = name
+        self.children = ()
+        self._parent = None
+        self.__dict__.update(attributes)
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent):
+        if self._parent is not None:
+            self._parent.children = tuple(c for c in self._parent.children
+                                          if c is not self)
+        self._parent = parent
+        if parent is not None:
+            parent.children += (self,)
+
+    @property
+    def is_root(self):
+        return self._parent is None
+
+    @property
+    def is_leaf(self):
+        return not self.children
+
+    @property
+    def siblings(self):
+        if self._parent is None:
+            return ()
+        return tuple(c for c in self._parent.children if c is not self)
+
+def tree_node_class():
+    """anytree's Node when installed (imported only when building a tree),
+        else 'SimpleNode'."""
+    try:
+        from anytree import Node
+    except ImportError:
+        Node = SimpleNode
+
+    return Node
+
 def build_tree(nodes):
+    Node = tree_node_class()
     programs_dict = {}
 
     # create all nodes
@@ -128,7 +176,9 @@ jptl (61)
 ugml (68) -> gyxo, ebii, jptl
 gyxo (61)
 cntj (57)"""
-assert solve_challenge_a(test_data_a) == "tknk"
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a(test_data_a) == "tknk"
 
 """
 The programs explain the situation: they can't get down. Rather, they could get
@@ -220,7 +270,9 @@ jptl (61)
 ugml (68) -> gyxo, ebii, jptl
 gyxo (61)
 cntj (57)"""
-assert solve_challenge_b(test_data_b) == 60
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b(test_data_b) == 60
 
 if __name__ == "__main__":
     puzzle_a(DAY, solve_challenge_a)
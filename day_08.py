@@ -30,21 +30,25 @@ What is the largest value in any register after completing the instructions in
 your puzzle input?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
+from cache import cached_parse
 
 DAY = 8
 
+def parse_line(line):
+    splitted = line.replace("if", "").split()
+    reg, direction, amount, cond_reg, cond_op, cond_amount = splitted
+    amount = int(amount)
+    cond_amount = int(cond_amount)
+    return (reg, direction, amount, cond_reg, cond_op, cond_amount)
+
+@cached_parse(DAY)
 def parse_data(data):
     lines = data.split("\n")
 
     instructions = []
     for line in lines:
-        splitted = line.replace("if", "").split()
-        reg, direction, amount, cond_reg, cond_op, cond_amount = splitted
-        amount = int(amount)
-        cond_amount = int(cond_amount)
-        instructions.append( (reg, direction, amount, cond_reg, cond_op, 
-                              cond_amount) )
+        instructions.append(parse_line(line))
 
     return instructions
 
@@ -66,10 +70,9 @@ def eval_cond(reg_state, cond_reg, cond_op, cond_amount):
 
 def execute_instructions(instructions, stage_eval_func=lambda x: x):
     """Executes instructions and applies 'stage_eval_func' (on internal state)
-        after each execution. Returns the list of results for each eval."""
+        after each execution. Lazily yields the result of each eval."""
 
     reg_state = {}
-    eval_results = []
     for reg, direction, amount, cond_reg, cond_op, cond_amount in instructions:
         if reg not in reg_state:
             reg_state[reg] = 0
@@ -83,22 +86,32 @@ def execute_instructions(instructions, stage_eval_func=lambda x: x):
             elif direction == "dec":
                 reg_state[reg] -= amount
 
-        eval_results.append(stage_eval_func(reg_state))
+        yield stage_eval_func(reg_state)
+
+def final_max_register(instructions):
+    max_regs = execute_instructions(instructions, lambda x: max(x.values()))
+    for max_reg in max_regs:
+        pass
 
-    return eval_results
+    return max_reg
 
 def solve_challenge_a(data):
     instructions = parse_data(data)
+    return final_max_register(instructions)
 
-    max_regs = execute_instructions(instructions, lambda x: max(x.values()))
-    return max_regs[-1]
+def solve_lines_a(lines):
+    """Same as 'solve_challenge_a', one instruction in memory at a time."""
+    return final_max_register(map(parse_line, lines))
 
 test_data_a = """\
 b inc 5 if a > 1
 a inc 1 if b < 5
 c dec -10 if a >= 1
 c inc -20 if c == 10"""
-assert solve_challenge_a(test_data_a) == 1
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a(test_data_a) == 1
+    assert solve_lines_a(iter(test_data_a.split("\n"))) == 1
 
 """
 To be safe, the CPU also needs to know the highest value held in any register
@@ -107,18 +120,27 @@ operations. For example, in the above instructions, the highest value ever held
 was 10 (in register c after the third instruction was evaluated).
 """
 
+def highest_max_register(instructions):
+    max_regs = execute_instructions(instructions, lambda x: max(x.values()))
+    return max(max_regs)
+
 def solve_challenge_b(data):
     instructions = parse_data(data)
+    return highest_max_register(instructions)
 
-    max_regs = execute_instructions(instructions, lambda x: max(x.values()))
-    return max(max_regs)
+def solve_lines_b(lines):
+    """Same as 'solve_challenge_b', one instruction in memory at a time."""
+    return highest_max_register(map(parse_line, lines))
 
 test_data_b = """\
 b inc 5 if a > 1
 a inc 1 if b < 5
 c dec -10 if a >= 1
 c inc -20 if c == 10"""
-assert solve_challenge_b(test_data_b) == 10
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b(test_data_b) == 10
+    assert solve_lines_b(iter(test_data_b.split("\n"))) == 10
 
 if __name__ == "__main__":
     puzzle_a(DAY, solve_challenge_a)
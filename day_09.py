@@ -63,7 +63,7 @@ immediately contains it. (The outermost group gets a score of 1.)
 What is the total score for all groups in your input?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
 import re
 
 DAY = 9
@@ -93,10 +93,12 @@ def clean_groups_score(stream):
     return total_score
     
 
-assert clean_groups_score("{}") == 1
-assert clean_groups_score("{{{}}}") == 6
-assert clean_groups_score("{{},{}}") == 5
-assert clean_groups_score("{{{},{},{{}}}}") == 16
+@self_test(DAY, "a")
+def test_clean_groups_score():
+    assert clean_groups_score("{}") == 1
+    assert clean_groups_score("{{{}}}") == 6
+    assert clean_groups_score("{{},{}}") == 5
+    assert clean_groups_score("{{{},{},{{}}}}") == 16
 
 def solve_challenge_a(data):
     stream = parse_data(data)
@@ -105,10 +107,12 @@ def solve_challenge_a(data):
 
     return clean_groups_score(stream)
 
-assert solve_challenge_a("{<a>,<a>,<a>,<a>}") == 1
-assert solve_challenge_a("{{<ab>},{<ab>},{<ab>},{<ab>}}") == 9
-assert solve_challenge_a("{{<!!>},{<!!>},{<!!>},{<!!>}}") == 9
-assert solve_challenge_a("{{<a!>},{<a!>},{<a!>},{<ab>}}") == 3
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a("{<a>,<a>,<a>,<a>}") == 1
+    assert solve_challenge_a("{{<ab>},{<ab>},{<ab>},{<ab>}}") == 9
+    assert solve_challenge_a("{{<!!>},{<!!>},{<!!>},{<!!>}}") == 9
+    assert solve_challenge_a("{{<a!>},{<a!>},{<a!>},{<ab>}}") == 3
 
 """
 Now, you're ready to remove the garbage.
@@ -138,13 +142,64 @@ def solve_challenge_b(data):
 
     return count_garbage_characters(stream)
 
-assert solve_challenge_b("<>") == 0
-assert solve_challenge_b("<random characters>") == 17
-assert solve_challenge_b("<<<<>") == 3
-assert solve_challenge_b("<{!>}>") == 2
-assert solve_challenge_b("<!!>") == 0
-assert solve_challenge_b("<!!!>>") == 0
-assert solve_challenge_b('<{o"i!a,<{i<a>') == 10
+def stream_stats(chunks):
+    """Single pass over a stream of text chunks (see utils.iter_chunks):
+        returns the total groups score and the number of garbage characters,
+        keeping only the current nesting state in memory."""
+    total_score = 0
+    current_group_score = 0
+    garbage_characters = 0
+    in_garbage = False
+    ignore_next = False
+
+    for chunk in chunks:
+        for c in chunk:
+            if ignore_next:
+                ignore_next = False
+            elif c == "!":
+                ignore_next = True
+            elif in_garbage:
+                if c == ">":
+                    in_garbage = False
+                else:
+                    garbage_characters += 1
+            elif c == "<":
+                in_garbage = True
+            elif c == "{":
+                current_group_score += 1
+                total_score += current_group_score
+            elif c == "}":
+                current_group_score -= 1
+
+    return total_score, garbage_characters
+
+def solve_chunks_a(chunks):
+    """Same as 'solve_challenge_a', over a stream of text chunks."""
+    return stream_stats(chunks)[0]
+
+def solve_chunks_b(chunks):
+    """Same as 'solve_challenge_b', over a stream of text chunks."""
+    return stream_stats(chunks)[1]
+
+@self_test(DAY, "a")
+def test_solve_chunks_a():
+    assert solve_chunks_a(["{{<a!", ">},{<a!>},{<a!>},{<ab>}}"]) == 3
+    assert solve_chunks_a(["{{{},{}", ",{{}}}}"]) == 16
+
+@self_test(DAY, "b")
+def test_solve_chunks_b():
+    assert solve_chunks_b(['<{o"i!', 'a,<{i<a>']) == 10
+    assert solve_chunks_b(["<!!", "!>>"]) == 0
+
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b("<>") == 0
+    assert solve_challenge_b("<random characters>") == 17
+    assert solve_challenge_b("<<<<>") == 3
+    assert solve_challenge_b("<{!>}>") == 2
+    assert solve_challenge_b("<!!>") == 0
+    assert solve_challenge_b("<!!!>>") == 0
+    assert solve_challenge_b('<{o"i!a,<{i<a>') == 10
 
 if __name__ == "__main__":
     puzzle_a(DAY, solve_challenge_a)
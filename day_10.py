@@ -72,7 +72,7 @@ However, you should instead use the standard list size of 256 (with values 0
     list?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
 from functools import reduce
 
 DAY = 10
@@ -115,8 +115,10 @@ def apply_transformations(lengths, n_pos=256):
 
     return positions
 
-assert apply_transformations([3, 4, 1, 5], n_pos=5)[0] == 3
-assert apply_transformations([3, 4, 1, 5], n_pos=5)[1] == 4
+@self_test(DAY, "a")
+def test_apply_transformations():
+    assert apply_transformations([3, 4, 1, 5], n_pos=5)[0] == 3
+    assert apply_transformations([3, 4, 1, 5], n_pos=5)[1] == 4
 
 def solve_challenge_a(data):
     lengths = parse_data(data)
@@ -194,7 +196,9 @@ def parse_data_b(data):
     data = [ord(i) for i in data]
     return data + [17, 31, 73, 47, 23]
 
-assert parse_data_b("1,2,3") == [49, 44, 50, 44, 51, 17, 31, 73, 47, 23]
+@self_test(DAY, "b")
+def test_parse_data_b():
+    assert parse_data_b("1,2,3") == [49, 44, 50, 44, 51, 17, 31, 73, 47, 23]
 
 def reverse_part(positions, current_position, length):
     final_position = current_position + length
@@ -250,10 +254,12 @@ def solve_challenge_b(data):
 
     return knot_hash
 
-assert solve_challenge_b("")         == "a2582a3a0e66e6e86e3812dcb672a272"
-assert solve_challenge_b("AoC 2017") == "33efeb34ea91902bb2f59c9920caa6cd"
-assert solve_challenge_b("1,2,3")    == "3efbe78a8d82f29979031a4aa0b16a9d"
-assert solve_challenge_b("1,2,4")    == "63960835bcdc130f0b66d7ff4f6a5a8e"
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b("")         == "a2582a3a0e66e6e86e3812dcb672a272"
+    assert solve_challenge_b("AoC 2017") == "33efeb34ea91902bb2f59c9920caa6cd"
+    assert solve_challenge_b("1,2,3")    == "3efbe78a8d82f29979031a4aa0b16a9d"
+    assert solve_challenge_b("1,2,4")    == "63960835bcdc130f0b66d7ff4f6a5a8e"
 
 
 if __name__ == "__main__":
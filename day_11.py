@@ -31,7 +31,8 @@ For example:
     se,sw,se,sw,sw is 3 steps away (s,s,sw).
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
+from utils import iter_chunks, iter_separated
 
 DAY = 11
 
@@ -46,9 +47,7 @@ def hex_manhattan_distance(a, b):
             + abs(a[1] - b[1])) // 2
 
 
-def solve_challenge_a(data):
-    steps = parse_data(data)
-
+def final_distance(steps):
     deltas = dict(n=(0,-1), ne=(1,-1), se=(1,0), s=(0,1), sw=(-1,1), nw=(-1,0))
     current_point = 0, 0
 
@@ -59,19 +58,27 @@ def solve_challenge_a(data):
 
     return hex_manhattan_distance(current_point, (0, 0))
 
+def solve_challenge_a(data):
+    steps = parse_data(data)
+    return final_distance(steps)
+
+def solve_tokens_a(steps):
+    """Same as 'solve_challenge_a', over a stream of steps (e.g. from
+        utils.iter_separated)."""
+    return final_distance(steps)
 
-assert solve_challenge_a("ne,ne,ne") == 3
-assert solve_challenge_a("ne,ne,sw,sw") == 0
-assert solve_challenge_a("ne,ne,s,s") == 2
-assert solve_challenge_a("se,sw,se,sw,sw") == 3
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a("ne,ne,ne") == 3
+    assert solve_challenge_a("ne,ne,sw,sw") == 0
+    assert solve_challenge_a("ne,ne,s,s") == 2
+    assert solve_challenge_a("se,sw,se,sw,sw") == 3
 
 """
 How many steps away is the furthest he ever got from his starting position?
 """
 
-def solve_challenge_b(data):
-    steps = parse_data(data)
-
+def furthest_distance(steps):
     deltas = dict(n=(0,-1), ne=(1,-1), se=(1,0), s=(0,1), sw=(-1,1), nw=(-1,0))
     current_point = 0, 0
 
@@ -84,6 +91,32 @@ def solve_challenge_b(data):
 
     return max_dist
 
+def solve_challenge_b(data):
+    steps = parse_data(data)
+    return furthest_distance(steps)
+
+def solve_tokens_b(steps):
+    """Same as 'solve_challenge_b', over a stream of steps."""
+    return furthest_distance(steps)
+
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b("ne,ne,sw,sw") == 2
+    assert solve_tokens_b(iter(["se", "sw", "se", "sw", "sw"])) == 3
+
+    import tempfile
+    data = "se,sw,se,sw,sw,ne,nw,n,s,s"
+    with tempfile.NamedTemporaryFile("w", suffix=".txt") as f:
+        f.write(data + "\n\n")
+        f.flush()
+
+        # chunks of these sizes split the steps between them
+        for size in (1, 2, 3, 4, 7, 100):
+            steps = iter_separated(iter_chunks(f.name, size), ",")
+            assert list(steps) == data.split(",")
+            steps = iter_separated(iter_chunks(f.name, size), ",")
+            assert solve_tokens_b(steps) == solve_challenge_b(data)
+
 if __name__ == "__main__":
     puzzle_a(DAY, solve_challenge_a)
     puzzle_b(DAY, solve_challenge_b)
\ No newline at end of file
@@ -50,12 +50,12 @@ has a pipe that connects it to itself.
 How many programs are in the group that contains program ID 0?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
+from cache import cached_parse
 
 DAY = 12
 
-def parse_data(data):
-    lines = data.split("\n")
+def parse_lines(lines):
     graph = {}
     for line in lines:
         node, neighbors = line.split(" <-> ")
@@ -63,6 +63,11 @@ def parse_data(data):
 
     return graph
 
+@cached_parse(DAY)
+def parse_data(data):
+    lines = data.split("\n")
+    return parse_lines(lines)
+
 
 def DFS(graph, starting_node=0):
     visited = {node:False for node, _ in graph.items()}
@@ -78,11 +83,17 @@ def DFS(graph, starting_node=0):
 
     return [k for k in visited if visited[k]]
 
+def count_reachable(graph):
+    reachable = DFS(graph)
+    return len(reachable)
+
 def solve_challenge_a(data):
     graph = parse_data(data)
+    return count_reachable(graph)
 
-    reachable = DFS(graph)
-    return len(reachable)
+def solve_lines_a(lines):
+    """Same as 'solve_challenge_a', without holding the input text."""
+    return count_reachable(parse_lines(lines))
 
 test_data = """\
 0 <-> 2
@@ -92,7 +103,10 @@ test_data = """\
 4 <-> 2, 3, 6
 5 <-> 6
 6 <-> 4, 5"""
-assert solve_challenge_a(test_data) == 6
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a(test_data) == 6
+    assert solve_lines_a(iter(test_data.split("\n"))) == 6
 
 """
 There are more programs than just the ones in the group containing program ID
@@ -110,8 +124,7 @@ In the example above, there were 2 groups: one consisting of programs
 How many groups are there in total?
 """
 
-def solve_challenge_b(data):
-    graph = parse_data(data)
+def count_groups(graph):
     nodes_to_visit = list(graph.keys())
 
     nr_components = 0
@@ -125,6 +138,14 @@ def solve_challenge_b(data):
 
     return nr_components
 
+def solve_challenge_b(data):
+    graph = parse_data(data)
+    return count_groups(graph)
+
+def solve_lines_b(lines):
+    """Same as 'solve_challenge_b', without holding the input text."""
+    return count_groups(parse_lines(lines))
+
 
 test_data_b = """\
 0 <-> 2
@@ -134,7 +155,10 @@ test_data_b = """\
 4 <-> 2, 3, 6
 5 <-> 6
 6 <-> 4, 5"""
-assert solve_challenge_b(test_data_b) == 2
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b(test_data_b) == 2
+    assert solve_lines_b(iter(test_data_b.split("\n"))) == 2
 
 
 if __name__ == "__main__":
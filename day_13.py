@@ -192,13 +192,11 @@ Given the details of the firewall you've recorded, if you leave immediately,
 what is the severity of your whole trip?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b, count_from
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, count_from
 
 DAY = 13
 
-def parse_data(data):
-    lines = data.split("\n")
-    
+def parse_lines(lines):
     scanners = []
     for line in lines:
         depth, scanner_range = line.split(": ")
@@ -206,12 +204,14 @@ def parse_data(data):
 
     return dict(scanners)
 
+def parse_data(data):
+    lines = data.split("\n")
+    return parse_lines(lines)
+
 def is_caught(depth, scanner_range, delay=0):
     return (depth + delay) % (2 * (scanner_range - 1)) == 0
 
-def solve_challenge_a(data):
-    scanners = parse_data(data)
-
+def trip_severity(scanners):
     severity = 0
     for depth, scanner_range in scanners.items():
         if is_caught(depth, scanner_range):
@@ -219,12 +219,23 @@ def solve_challenge_a(data):
 
     return severity
 
+def solve_challenge_a(data):
+    scanners = parse_data(data)
+    return trip_severity(scanners)
+
+def solve_lines_a(lines):
+    """Same as 'solve_challenge_a', without holding the input text."""
+    return trip_severity(parse_lines(lines))
+
 test_data = """\
 0: 3
 1: 2
 4: 4
 6: 4"""
-assert solve_challenge_a(test_data) == 24
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a(test_data) == 24
+    assert solve_lines_a(iter(test_data.split("\n"))) == 24
 
 """
 Now, you need to pass through the firewall without being caught - easier said
@@ -349,9 +360,7 @@ What is the fewest number of picoseconds that you need to delay the packet to
 pass through the firewall without being caught?
 """
 
-def solve_challenge_b(data):
-    scanners = parse_data(data)
-
+def smallest_safe_delay(scanners):
     for delay in count_from(0):
         caught = False
         for depth, scanner_range in scanners.items():
@@ -360,14 +369,24 @@ def solve_challenge_b(data):
 
         if not caught:
             return delay
-        
+
+def solve_challenge_b(data):
+    scanners = parse_data(data)
+    return smallest_safe_delay(scanners)
+
+def solve_lines_b(lines):
+    """Same as 'solve_challenge_b', without holding the input text."""
+    return smallest_safe_delay(parse_lines(lines))
 
 test_data_b = """\
 0: 3
 1: 2
 4: 4
 6: 4"""
-assert solve_challenge_b(test_data) == 10
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b(test_data) == 10
+    assert solve_lines_b(iter(test_data.split("\n"))) == 10
 
 
 if __name__ == "__main__":
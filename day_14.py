@@ -48,7 +48,8 @@ In this example, 8108 squares are used across the entire 128x128 grid.
 Given your actual key string, how many squares are used?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b, hex_to_bin, chunks_of
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
+from utils import hex_to_bin, chunks_of
 from day_10 import solve_challenge_b as knot_hash
 
 DAY = 14
@@ -70,7 +71,9 @@ def solve_challenge_a(data):
     disk = get_disk_repr(key)
     return len([i for i in disk if i == '1'])
 
-assert solve_challenge_a("flqrgnkx") == 8108
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a("flqrgnkx") == 8108
 
 """
 Now, all the defragmenter needs to know is the number of regions. A region is a
@@ -145,7 +148,9 @@ def solve_challenge_b(data):
     r = fill_disk(disk)
     return r - 1
 
-assert solve_challenge_b("flqrgnkx") == 1242
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b("flqrgnkx") == 1242
 
 if __name__ == "__main__":
     puzzle_a(DAY, solve_challenge_a)
@@ -56,8 +56,8 @@ that match in their lowest 16 bits.)
 After 40 million pairs, what is the judge's final count?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
-from numba import jit
+from utils import read_input_data, puzzle_a, puzzle_b, self_test, lazy_jit
+from checkpoint import run_checkpointed
 
 DAY = 15
 
@@ -65,40 +65,61 @@ def parse_data(data):
     a, b = data.split("\n")
     return int(a.split()[-1]), int(b.split()[-1])
 
-@jit
+@lazy_jit
 def generator(starting_value, factor):
     val = starting_value
     while True:
         val = val * factor % 2147483647
         yield val
 
-assert next(generator(65, 16807)) == 1092455
-assert next(generator(8921, 48271)) == 430625591
+@self_test(DAY, "a")
+def test_generator():
+    assert next(generator(65, 16807)) == 1092455
+    assert next(generator(8921, 48271)) == 430625591
 
 def compare_streams(g1, g2, pair_count=40*10**6):
+    """Number of pairs matching in their lowest 16 bits, and the last values
+        of both generators."""
     found = 0
     for _ in range(pair_count):
-        a = next(g1) & 0xFFFF
-        b = next(g2) & 0xFFFF
+        a = next(g1)
+        b = next(g2)
 
-        if a == b:
+        if a & 0xFFFF == b & 0xFFFF:
             found += 1
 
+    return found, a, b
+
+def judge(name, start_a, start_b, make_generators, pair_count):
+    """'compare_streams' on the generators 'make_generators(a, b)' makes,
+        through 'checkpoint.run_checkpointed': each span of pairs restarts
+        them from the last values they yielded."""
+    def advance(state, start, stop):
+        a, b, found = state
+        span_found, a, b = compare_streams(*make_generators(a, b),
+                                           pair_count=stop - start)
+        return (a, b, found + span_found), stop
+
+    (_, _, found), _ = run_checkpointed(name, f"{start_a},{start_b}",
+                                        (start_a, start_b, 0), advance,
+                                        total=pair_count)
     return found
 
 def solve_challenge_a(data):
     start_a, start_b = parse_data(data)
 
-    gen_a = generator(start_a, 16807)
-    gen_b = generator(start_b, 48271)
+    def make_generators(a, b):
+        return generator(a, 16807), generator(b, 48271)
 
-    return compare_streams(gen_a, gen_b)
+    return judge("day_15a", start_a, start_b, make_generators, 40*10**6)
 
 
 test_data = """\
 Generator A starts with 65
 Generator B starts with 8921"""
-assert solve_challenge_a(test_data) == 588
+@self_test(DAY, "a", slow=True)
+def test_challenge_a():
+    assert solve_challenge_a(test_data) == 588
 
 """
 In the interest of trying to align a little better, the generators get more
@@ -167,7 +188,7 @@ After 5 million pairs, but using this new generator logic, what is the judge's
 final count?
 """
 
-@jit
+@lazy_jit
 def generator_selective(starting_value, factor, multiple):
     val = starting_value
     while True:
@@ -175,22 +196,27 @@ def generator_selective(starting_value, factor, multiple):
         if val % multiple == 0:
             yield val
 
-assert next(generator_selective(65, 16807, 4)) == 1352636452
-assert next(generator_selective(8921, 48271, 8)) == 1233683848
+@self_test(DAY, "b")
+def test_generator_selective():
+    assert next(generator_selective(65, 16807, 4)) == 1352636452
+    assert next(generator_selective(8921, 48271, 8)) == 1233683848
 
 def solve_challenge_b(data):
     start_a, start_b = parse_data(data)
 
-    gen_a = generator_selective(start_a, 16807, 4)
-    gen_b = generator_selective(start_b, 48271, 8)
+    def make_generators(a, b):
+        return (generator_selective(a, 16807, 4),
+                generator_selective(b, 48271, 8))
 
-    return compare_streams(gen_a, gen_b, pair_count=5*10**6)
+    return judge("day_15b", start_a, start_b, make_generators, 5*10**6)
 
 
 test_data = """\
 Generator A starts with 65
 Generator B starts with 8921"""
-assert solve_challenge_b(test_data) == 309
+@self_test(DAY, "b", slow=True)
+def test_challenge_b():
+    assert solve_challenge_b(test_data) == 309
 
 
 
@@ -25,22 +25,27 @@ You watch the dance for a while and record their dance moves (your puzzle
 input). In what order are the programs standing after their dance?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
+from cache import cached_parse
 
 DAY = 16
 
-def parse_data(data):
-    sequences = data.split(",")
-    moves = []
+def parse_moves(sequences):
+    """Lazily parses a stream of dance moves (e.g. utils.iter_separated)."""
     for s in sequences:
         if s[0] == "s":
-            moves.append( ("s", int(s[1:])) )
+            yield ("s", int(s[1:]))
         if s[0] == "x":
             a, b = s[1:].split("/")
-            moves.append( ("x", (int(a), int(b))) )
+            yield ("x", (int(a), int(b)))
         if s[0] == "p":
             a, b = s[1:].split("/")
-            moves.append( ("p", (a, b)) )
+            yield ("p", (a, b))
+
+@cached_parse(DAY)
+def parse_data(data):
+    sequences = data.split(",")
+    moves = list(parse_moves(sequences))
 
     return moves
 
@@ -63,9 +68,7 @@ def move_p(state, val):
 
     move_x(state, (ix_a, ix_b) )
 
-def solve_challenge_a(data, initial_size=16):
-    moves = parse_data(data)
-
+def dance(moves, initial_size=16):
     state = list(map(chr, range(ord('a'), ord('a')+initial_size)))
 
     for move, val in moves:
@@ -78,8 +81,19 @@ def solve_challenge_a(data, initial_size=16):
 
     return "".join(state)
 
+def solve_challenge_a(data, initial_size=16):
+    moves = parse_data(data)
+    return dance(moves, initial_size)
+
+def solve_tokens_a(sequences, initial_size=16):
+    """Same as 'solve_challenge_a', one move in memory at a time."""
+    return dance(parse_moves(sequences), initial_size)
+
 test_data = "s1,x3/4,pe/b"
-assert solve_challenge_a(test_data, 5) == "baedc"
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a(test_data, 5) == "baedc"
+    assert solve_tokens_a(iter(test_data.split(",")), 5) == "baedc"
 
 """
 Now that you're starting to get a feel for the dance moves, you turn your
@@ -101,6 +115,14 @@ In what order are the programs standing after their billion dances?
 
 def solve_challenge_b(data, initial_size=16, repeats=10**7):
     moves = parse_data(data)
+    return repeated_dance(moves, initial_size, repeats)
+
+def solve_tokens_b(sequences, initial_size=16, repeats=10**7):
+    """Same as 'solve_challenge_b', without holding the input text (the
+        parsed moves are kept, as the dance is repeated)."""
+    return repeated_dance(list(parse_moves(sequences)), initial_size, repeats)
+
+def repeated_dance(moves, initial_size=16, repeats=10**7):
     state_history = []
 
     state = list(map(chr, range(ord('a'), ord('a')+initial_size)))
@@ -56,7 +56,8 @@ would be 638.
 What is the value after 2017 in your completed circular buffer?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
+from checkpoint import run_checkpointed
 
 DAY = 17
 
@@ -77,7 +78,9 @@ def solve_challenge_a(data):
 
     return state[state.index(2017)+1]
 
-assert solve_challenge_a(3) == 638
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a(3) == 638
 
 """
 The spinlock does not short-circuit. Instead, it gets more angry. At least, you
@@ -96,22 +99,29 @@ finished inserting its fifty millionth value (50000000).
 What is the value after 0 the moment 50000000 is inserted?
 """
 
-def solve_challenge_b(data):
+def solve_challenge_b(data, nr_insertions=50000000):
     steps = parse_data(data)
-    nr_insertions = 50000000
 
-    state = [0]
-    current_pos = 0
-    rv = None
-    for i in range(1, nr_insertions+1):
-        current_pos = (current_pos + steps) % i
+    def advance(state, start, stop):
+        current_pos, rv = state
+        for i in range(start+1, stop+1):
+            current_pos = (current_pos + steps) % i
 
-        if current_pos == 0:
-            rv = i
-        current_pos += 1
+            if current_pos == 0:
+                rv = i
+            current_pos += 1
+
+        return (current_pos, rv), stop
 
+    (_, rv), _ = run_checkpointed("day_17b", str(steps), (0, None), advance,
+                                  total=nr_insertions)
     return rv
 
+@self_test(DAY, "b")
+def test_challenge_b():
+    # 0 (9) 5  7  2  4  3  8  6  1
+    assert solve_challenge_b(3, 9) == 9
+
 if __name__ == "__main__":
     puzzle_a(DAY, solve_challenge_a)
     puzzle_b(DAY, solve_challenge_b)
\ No newline at end of file
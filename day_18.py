@@ -67,7 +67,7 @@ played sound) the first time a rcv instruction is executed with a non-zero
 value?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
 from collections import defaultdict, deque
 
 DAY = 18
@@ -121,7 +121,9 @@ rcv a
 jgz a -1
 set a 1
 jgz a -2"""
-assert solve_challenge_a(test_data_a) == 4
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a(test_data_a) == 4
 
 """
 As you congratulate yourself for a job well done, you notice that the
@@ -218,7 +220,9 @@ rcv a
 rcv b
 rcv c
 rcv d"""
-assert solve_challenge_b(test_data_b) == 3
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b(test_data_b) == 3
 
 if __name__ == "__main__":
     puzzle_a(DAY, solve_challenge_a)
@@ -37,7 +37,7 @@ letters will it see (in the order it would see them) if it follows the path?
 (The routing diagram is very wide; make sure you view it without line wrapping.)
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
 
 DAY = 19
 
@@ -120,7 +120,9 @@ test_data_a = """\
  F---|----E|--+ 
      |  |  |  D 
      +B-+  +--+ """
-assert solve_challenge_a(test_data_a) == "ABCDEF"
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a(test_data_a) == "ABCDEF"
 
 """
 The packet is curious how many steps it needs to go.
@@ -161,7 +163,9 @@ test_data_b = """\
  F---|----E|--+ 
      |  |  |  D 
      +B-+  +--+ """
-assert solve_challenge_b(test_data_b) == 38
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b(test_data_b) == 38
 
 if __name__ == "__main__":
     puzzle_a(DAY, solve_challenge_a)
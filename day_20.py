@@ -48,12 +48,12 @@ so, in the long run, particle 0 will stay closest.
 Which particle will stay closest to position <0,0,0> in the long term?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
+from cache import cached_parse
 
 DAY = 20
 
-def parse_data(data):
-    lines = data.split("\n")
+def parse_lines(lines):
     particles = []
 
     for line in lines:
@@ -65,6 +65,11 @@ def parse_data(data):
 
     return particles
 
+@cached_parse(DAY)
+def parse_data(data):
+    lines = data.split("\n")
+    return parse_lines(lines)
+
 def origin_distance(particle):
     (p_a, p_b, p_c), _, __ = particle
     return abs(p_a) + abs(p_b) + abs(p_c)
@@ -82,20 +87,29 @@ def update_particle(particle):
     return ((new_p_a, new_p_b, new_p_c), (new_v_a, new_v_b, new_v_c),
             (a_a, a_b, a_c))
 
-def solve_challenge_a(data):
-    particles = parse_data(data)
-
+def closest_particle(particles):
     for _ in range(1000):
         for ix, particle in enumerate(particles):
             particles[ix] = update_particle(particle)
 
     return min(enumerate(particles), key=lambda x: origin_distance(x[1]))[0]
 
+def solve_challenge_a(data):
+    particles = parse_data(data)
+    return closest_particle(particles)
+
+def solve_lines_a(lines):
+    """Same as 'solve_challenge_a', without holding the input text."""
+    return closest_particle(parse_lines(lines))
+
     
 test_data_a = """\
 p=<3,0,0>, v=<2,0,0>, a=<-1,0,0>
 p=<4,0,0>, v=<0,0,0>, a=<-2,0,0>"""
-assert solve_challenge_a(test_data_a) == 0
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a(test_data_a) == 0
+    assert solve_lines_a(iter(test_data_a.split("\n"))) == 0
 
 """
 To simplify the problem further, the GPU would like to remove any particles
@@ -142,9 +156,7 @@ def remove_collisions(particles):
 
     return [v[0] for k, v in d.items() if len(v) == 1]
 
-def solve_challenge_b(data):
-    particles = parse_data(data)
-
+def count_survivors(particles):
     for _ in range(1000):
         for ix, particle in enumerate(particles):
             particles[ix] = update_particle(particle)
@@ -153,13 +165,24 @@ def solve_challenge_b(data):
 
     return len(particles)
 
+def solve_challenge_b(data):
+    particles = parse_data(data)
+    return count_survivors(particles)
+
+def solve_lines_b(lines):
+    """Same as 'solve_challenge_b', without holding the input text."""
+    return count_survivors(parse_lines(lines))
+
     
 test_data_b = """\
 p=<-6,0,0>, v=< 3,0,0>, a=< 0,0,0>
 p=<-4,0,0>, v=< 2,0,0>, a=< 0,0,0>
 p=<-2,0,0>, v=< 1,0,0>, a=< 0,0,0>
 p=< 3,0,0>, v=<-1,0,0>, a=< 0,0,0>"""
-assert solve_challenge_b(test_data_b) == 1
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b(test_data_b) == 1
+    assert solve_lines_b(iter(test_data_b.split("\n"))) == 1
 
 if __name__ == "__main__":
     puzzle_a(DAY, solve_challenge_a)
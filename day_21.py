@@ -107,7 +107,8 @@ Thus, after 2 iterations, the grid contains 12 pixels that are on.
 How many pixels stay on after 5 iterations?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
+from cache import cached_parse
 from math import sqrt
 
 DAY = 21
@@ -121,6 +122,7 @@ def rotate(subgrid):
 def flip(subgrid): 
     return tuple(tuple(reversed(row)) for row in subgrid)
 
+@cached_parse(DAY)
 def parse_data(data):
     lines = data.split("\n")
     rules = {}
@@ -182,7 +184,9 @@ def solve_challenge_a(data, n_iters=5):
 test_data_a = """\
 ../.# => ##./#../...
 .#./..#/### => #..#/..../..../#..#"""
-assert solve_challenge_a(test_data_a, 2) == 12
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a(test_data_a, 2) == 12
 
 """
 How many pixels stay on after 18 iterations?
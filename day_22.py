@@ -120,7 +120,8 @@ Given your actual map, after 10000 bursts of activity, how many bursts cause a
 node to become infected? (Do not count nodes that begin infected.)
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
+from checkpoint import run_checkpointed
 
 DAY = 22
 
@@ -177,8 +178,10 @@ test_data_a = """\
 .........
 .........
 ........."""
-assert solve_challenge_a(test_data_a, 7) == 5
-assert solve_challenge_a(test_data_a) == 5587
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a(test_data_a, 7) == 5
+    assert solve_challenge_a(test_data_a) == 5587
 
 """
 As you go to remove the virus from the infected nodes, it evolves to resist
@@ -295,11 +298,12 @@ def turn_back(direction):
     return dict(up='down', down='up', left='right', right='left')[direction]
 
 
-from collections import defaultdict
 def solve_challenge_b(data, n_iter=10000000):
     infection_map = parse_data(data)
 
-    cells = defaultdict(lambda: 'C')
+    # a plain dict of the non-clean cells, so that checkpoints of the state
+    # do not depend on a default factory from the module that wrote them
+    cells = {}
 
     for i in range(len(infection_map)):
         for j in range(len(infection_map[0])):
@@ -310,24 +314,32 @@ def solve_challenge_b(data, n_iter=10000000):
     y = len(infection_map) // 2
     direction = 'up'
     nr_infections = 0
-    
-    for i in range(n_iter):
-        if cells[(x,y)] == 'C':
-            direction = turn_left(direction)
-            cells[(x,y)] = 'W'
-        elif cells[(x,y)] == 'F':
-            direction = turn_back(direction)
-            cells[(x,y)] = 'C'
-        elif cells[(x,y)] == 'W':
-            cells[(x,y)] = 'I'
-            nr_infections += 1
-        elif cells[(x,y)] == 'I':
-            direction = turn_right(direction)
-            cells[(x,y)] = 'F'            
-            
-        x, y = step(x, y, direction)
 
-    return nr_infections
+    def advance(state, start, stop):
+        cells, x, y, direction, nr_infections = state
+        for i in range(start, stop):
+            cell = cells.get((x,y), 'C')
+            if cell == 'C':
+                direction = turn_left(direction)
+                cells[(x,y)] = 'W'
+            elif cell == 'F':
+                direction = turn_back(direction)
+                del cells[(x,y)]
+            elif cell == 'W':
+                cells[(x,y)] = 'I'
+                nr_infections += 1
+            elif cell == 'I':
+                direction = turn_right(direction)
+                cells[(x,y)] = 'F'
+
+            x, y = step(x, y, direction)
+
+        return (cells, x, y, direction, nr_infections), stop
+
+    state = cells, x, y, direction, nr_infections
+    state, _ = run_checkpointed("day_22b", data, state, advance,
+                                total=n_iter)
+    return state[-1]
 
     
 test_data_b = """\
@@ -339,8 +351,13 @@ test_data_b = """\
 .........
 .........
 ........."""
-assert solve_challenge_b(test_data_b, 100) == 26
-assert solve_challenge_b(test_data_b) == 2511944
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b(test_data_b, 100) == 26
+
+@self_test(DAY, "b", slow=True)
+def test_challenge_b_full():
+    assert solve_challenge_b(test_data_b) == 2511944
 
 
 if __name__ == "__main__":
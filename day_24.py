@@ -60,14 +60,12 @@ What is the strength of the strongest bridge you can make with the components
 you have available?
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
 from collections import defaultdict
 
 DAY = 24
 
-def parse_data(data):
-    lines = data.split("\n")
-
+def parse_lines(lines):
     tubes = []
     for line in lines:
         a, b = line.split("/")
@@ -75,6 +73,10 @@ def parse_data(data):
 
     return tubes
 
+def parse_data(data):
+    lines = data.split("\n")
+    return parse_lines(lines)
+
 def match_tube(size, tube):
     return size == tube[0] or size == tube[1]
 
@@ -104,14 +106,22 @@ def valid_bridges(start, tubes):
 def bridge_strength(bridge):
     return sum(map(sum, bridge))
 
-assert bridge_strength([(0, 3), (3, 7), (7, 4)]) == 24
+@self_test(DAY, "a")
+def test_bridge_strength():
+    assert bridge_strength([(0, 3), (3, 7), (7, 4)]) == 24
 
 
+def strongest_bridge(tubes):
+    bridges = valid_bridges(0, tubes)
+    return max(map(bridge_strength, bridges))
+
 def solve_challenge_a(data):
     tubes = parse_data(data)
+    return strongest_bridge(tubes)
 
-    bridges = valid_bridges(0, tubes)
-    return max(map(bridge_strength, bridges))
+def solve_lines_a(lines):
+    """Same as 'solve_challenge_a', without holding the input text."""
+    return strongest_bridge(parse_lines(lines))
 
 test_data_a = """\
 0/2
@@ -123,7 +133,10 @@ test_data_a = """\
 10/1
 9/10"""
 
-assert solve_challenge_a(test_data_a) == 31
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert solve_challenge_a(test_data_a) == 31
+    assert solve_lines_a(iter(test_data_a.split("\n"))) == 31
 
 """
 The bridge you've built isn't long enough; you can't jump the rest of the way.
@@ -140,11 +153,17 @@ What is the strength of the longest bridge you can make? If you can make
 multiple bridges of the longest length, pick the strongest one.
 """
 
+def longest_bridge_strength(tubes):
+    bridges = valid_bridges(0, tubes)
+    return max([(len(b), bridge_strength(b)) for b in bridges])[1]
+
 def solve_challenge_b(data):
     tubes = parse_data(data)
+    return longest_bridge_strength(tubes)
 
-    bridges = valid_bridges(0, tubes)
-    return max([(len(b), bridge_strength(b)) for b in bridges])[1]
+def solve_lines_b(lines):
+    """Same as 'solve_challenge_b', without holding the input text."""
+    return longest_bridge_strength(parse_lines(lines))
 
 test_data_b = """\
 0/2
@@ -156,7 +175,10 @@ test_data_b = """\
 10/1
 9/10"""
 
-assert solve_challenge_b(test_data_b) == 19
+@self_test(DAY, "b")
+def test_challenge_b():
+    assert solve_challenge_b(test_data_b) == 19
+    assert solve_lines_b(iter(test_data_b.split("\n"))) == 19
 
 if __name__ == "__main__":
     puzzle_a(DAY, solve_challenge_a)
@@ -90,8 +90,10 @@ checksum it produces once it's working again?
 
 """
 
-from utils import read_input_data, puzzle_a, puzzle_b
+from utils import read_input_data, puzzle_a, puzzle_b, self_test
+from checkpoint import run_checkpointed
 from collections import defaultdict
+import re
 
 DAY = 25
 
@@ -101,10 +103,27 @@ states = dict(
     C = ((1, -1, 'D'), (0, +1, 'C')),
     D = ((1, -1, 'E'), (0, -1, 'F')),
     E = ((1, -1, 'A'), (1, -1, 'C')),
-    F = ((1, -1, 'E'), (0, +1, 'A'))
+    F = ((1, -1, 'E'), (1, +1, 'A'))
 )
 
-def execute_step(tape):
+def parse_data(data):
+    """The blueprint's initial state, number of steps and state table, in the
+        format of 'states' above."""
+    start_state = re.search(r"Begin in state (\w+)\.", data).group(1)
+    nr_steps = int(re.search(r"after (\d+) steps", data).group(1))
+
+    table = {}
+    for block in data.split("In state ")[1:]:
+        state = block[:block.index(":")]
+        actions = re.findall(r"Write the value (\d)\.\s*"
+                             r"- Move one slot to the (left|right)\.\s*"
+                             r"- Continue with state (\w+)\.", block)
+        table[state] = tuple((int(value), -1 if move == "left" else +1, nxt)
+                             for value, move, nxt in actions)
+
+    return start_state, nr_steps, table
+
+def execute_step(tape, states=states):
     state = tape['current_state']
     if tape['values'][tape['cursor']] == 0:
         write_value, move, next_state = states[state][0]
@@ -117,13 +136,45 @@ def execute_step(tape):
 
 
 def solve_challenge_a(data):
-    tape = dict(values=defaultdict(int), cursor=0, current_state='A')
-    nr_steps = 12386363
+    start_state, nr_steps, table = parse_data(data)
+    tape = dict(values=defaultdict(int), cursor=0, current_state=start_state)
+
+    def advance(tape, start, stop):
+        for i in range(start, stop):
+            execute_step(tape, table)
 
-    for i in range(nr_steps):
-        execute_step(tape)
+        return tape, stop
 
+    tape, _ = run_checkpointed("day_25a", data, tape, advance, total=nr_steps)
     return sum(tape['values'].values())
 
+test_data = """\
+Begin in state A.
+Perform a diagnostic checksum after 6 steps.
+
+In state A:
+  If the current value is 0:
+    - Write the value 1.
+    - Move one slot to the right.
+    - Continue with state B.
+  If the current value is 1:
+    - Write the value 0.
+    - Move one slot to the left.
+    - Continue with state B.
+
+In state B:
+  If the current value is 0:
+    - Write the value 1.
+    - Move one slot to the left.
+    - Continue with state A.
+  If the current value is 1:
+    - Write the value 1.
+    - Move one slot to the right.
+    - Continue with state A."""
+@self_test(DAY, "a")
+def test_challenge_a():
+    assert parse_data(read_input_data(DAY))[2] == states
+    assert solve_challenge_a(test_data) == 3
+
 if __name__ == "__main__":
-    puzzle_a(DAY, solve_challenge_a)
\ No newline at end of file
+    puzzle_a(DAY, solve_challenge_a)
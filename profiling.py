@@ -0,0 +1,136 @@
+# profiling.py
+
+"""
+Profiles a single solver call and writes the report to a folder:
+
+    cprofile     deterministic profile: '<name>.prof' (for pstats / snakeviz)
+                 and '<name>.txt' with the top functions and their callers
+    sample       statistical line profile, sampling the running line every
+                 millisecond: '<name>.lines.txt' with the hottest lines and
+                 '<name>.folded' with stacks for flame graph tools
+    tracemalloc  allocations still alive at the end of the call, plus the
+                 peak: '<name>.alloc.txt' with the top lines by size
+
+'utils.puzzle_a' / 'utils.puzzle_b' use it when AOC_PROFILE is set to one of
+the modes (e.g. AOC_PROFILE=cprofile python day_22.py); AOC_PROFILE_DIR picks
+the folder (default: ./profiles).
+"""
+
+import collections
+import os
+import sys
+import threading
+
+PROFILE_MODES = ("cprofile", "sample", "tracemalloc")
+PROFILE_MODE = os.environ.get("AOC_PROFILE") or None
+PROFILE_FOLDER = os.environ.get("AOC_PROFILE_DIR", "./profiles")
+
+def profile_call(mode, func, *args, name="profile", folder=None, top=30):
+    """Returns func(*args), profiled with 'mode'; the report files are named
+        after 'name' and written to 'folder'."""
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"unknown profile mode {mode!r}, "
+                         f"expected one of {', '.join(PROFILE_MODES)}")
+
+    folder = folder or PROFILE_FOLDER
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, name)
+
+    if mode == "cprofile":
+        return run_cprofile(func, args, path, top)
+    elif mode == "sample":
+        return run_sampler(func, args, path, top)
+    elif mode == "tracemalloc":
+        return run_tracemalloc(func, args, path, top)
+
+def run_cprofile(func, args, path, top):
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    rv = profiler.runcall(func, *args)
+    profiler.dump_stats(f"{path}.prof")
+
+    with open(f"{path}.txt", "w") as f:
+        stats = pstats.Stats(profiler, stream=f)
+        stats.sort_stats("cumulative").print_stats(top)
+        stats.print_callers(top)
+
+    return rv
+
+class Sampler:
+    """Samples the stack of a thread from a background thread."""
+
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.lines = collections.Counter()
+        self.stacks = collections.Counter()
+        self.nr_samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            code = frame.f_code
+            self.lines[(code.co_filename, frame.f_lineno, code.co_name)] += 1
+
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code.co_name)
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.nr_samples += 1
+
+def run_sampler(func, args, path, top):
+    with Sampler(threading.get_ident()) as sampler:
+        rv = func(*args)
+
+    total = max(sampler.nr_samples, 1)
+    with open(f"{path}.lines.txt", "w") as f:
+        f.write(f"{sampler.nr_samples} samples every "
+                f"{sampler.interval * 1000:g} ms\n\n")
+        for (filename, lineno, funcname), count in \
+                sampler.lines.most_common(top):
+            f.write(f"{count / total:7.1%} {count:8d}  "
+                    f"{os.path.basename(filename)}:{lineno} ({funcname})\n")
+
+    with open(f"{path}.folded", "w") as f:
+        for stack, count in sampler.stacks.items():
+            f.write(f"{stack} {count}\n")
+
+    return rv
+
+def run_tracemalloc(func, args, path, top):
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        rv = func(*args)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ])
+    with open(f"{path}.alloc.txt", "w") as f:
+        f.write(f"peak traced memory: {peak / 1024:.1f} KiB\n\n")
+        for stat in snapshot.statistics("lineno")[:top]:
+            f.write(f"{stat}\n")
+
+    return rv
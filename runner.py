@@ -0,0 +1,317 @@
+# runner.py
+
+"""
+Solves every part of every day in worker processes and prints a report with
+the answer, wall time, CPU time and peak RSS of each part.
+
+    python -m runner                 # all days, one worker per CPU
+    python -m runner 5 6 -j 2        # selected days on two workers
+    python -m runner 8 -p b -i a.txt -i b.txt   # part b on other inputs
+    python -m runner 1 2 --repeat 5 --format json
+    python -m runner 15 17 --timeout 10
+    python -m runner --timeout 60 --timeout 22.b=300 --max-rss 512
+    python -m runner 22 --profile sample --profile-dir profiles/
+
+With --repeat, each part is solved that many times in its worker and the
+wall and CPU times are the best of the runs (the median wall time is
+reported too). --timeout and --max-rss set budgets of wall time and RSS, for
+all parts or selected days / parts: a part going over its budget is stopped
+and reported as such (status "timeout" or "memory"), the others still run.
+--format json prints the results as a JSON document: the environment, the
+total wall time and one record per part.
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import platform
+import re
+import resource
+import signal
+import statistics
+import sys
+import time
+
+from profiling import PROFILE_MODES, profile_call
+from utils import PARTS, day_str, get_solver, input_path, read_input_data
+
+def discover_days(folder=None):
+    """Day numbers of the 'day_XX.py' modules found in 'folder' (by default,
+        the one holding this file)."""
+    folder = folder or os.path.dirname(os.path.abspath(__file__))
+    days = []
+    for path in glob.glob(os.path.join(folder, "day_*.py")):
+        match = re.fullmatch(r"day_(\d+)\.py", os.path.basename(path))
+        if match:
+            days.append(int(match.group(1)))
+
+    return sorted(days)
+
+def discover_parts(days):
+    """(day, part) pairs for every solver defined by the given days."""
+    parts = []
+    for day in days:
+        for part in PARTS:
+            try:
+                if get_solver(day, part) is None:
+                    continue
+            except Exception:
+                pass # import errors are reported when the part is run
+            parts.append((day, part))
+
+    return parts
+
+def peak_rss_kb():
+    """Peak resident set size of this process, in KiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+class PartTimeout(Exception):
+    pass
+
+def _raise_timeout(signum, frame):
+    raise PartTimeout()
+
+@contextlib.contextmanager
+def time_limit(seconds):
+    """Raises PartTimeout in the block once it runs for 'seconds' of wall
+        time (no limit when None). Only usable in a process' main thread."""
+    if not seconds:
+        yield
+        return
+
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def read_input_file(path):
+    with open(path, 'r') as f:
+        return f.read().rstrip("\n")
+
+def run_part(day, part, path=None, repeat=1, timeout=None, profile=None,
+             profile_dir=None):
+    """Solves one part 'repeat' times on the input at 'path' (by default, the
+        day's own), optionally under the 'profile' mode of 'profiling';
+        meant to run in a worker process."""
+    result = dict(day=day, part=part, input=path or input_path(day),
+                  status="ok", answer=None, error=None, repeat=repeat)
+
+    walls, cpus = [], []
+    try:
+        with time_limit(timeout):
+            solver = get_solver(day, part)
+            data = read_input_file(path) if path else read_input_data(day)
+            for i in range(repeat):
+                wall_start = time.perf_counter()
+                cpu_start = time.process_time()
+                if profile and i == 0:
+                    name = f"day_{day_str(day)}{part}"
+                    result["answer"] = profile_call(profile, solver, data,
+                                                    name=name,
+                                                    folder=profile_dir)
+                else:
+                    result["answer"] = solver(data)
+                walls.append(time.perf_counter() - wall_start)
+                cpus.append(time.process_time() - cpu_start)
+    except PartTimeout:
+        result["status"] = "timeout"
+        result["error"] = f"timed out after {timeout:g} s"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = repr(e)
+
+    result["wall"] = min(walls, default=None)
+    result["wall_median"] = statistics.median(walls) if walls else None
+    result["cpu"] = min(cpus, default=None)
+    result["peak_rss_kb"] = peak_rss_kb()
+    return result
+
+def current_rss_kb(pid):
+    """Resident set size of the process 'pid', in KiB, or None where /proc
+        is not available."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+def budget_for(budgets, day, part):
+    """The most specific of the (day, part), (day, None) and (None, None)
+        entries of 'budgets', or None."""
+    for key in ((day, part), (day, None), (None, None)):
+        if key in budgets:
+            return budgets[key]
+
+    return None
+
+def _run_part_in_child(conn, args):
+    conn.send(run_part(*args))
+    conn.close()
+
+def stopped_result(day, part, path, repeat, status, error, rss_kb):
+    return dict(day=day, part=part, input=path or input_path(day),
+                status=status, answer=None, error=error, repeat=repeat,
+                wall=None, wall_median=None, cpu=None,
+                peak_rss_kb=rss_kb or 0)
+
+# grace period for a part to report its own timeout before it gets killed
+KILL_GRACE = 1.0
+WATCH_INTERVAL = 0.05
+
+def run_parts(parts, jobs=None, repeat=1, timeouts=None, max_rss=None,
+              profile=None, profile_dir=None):
+    """Runs the (day, part, input path) triples (the path may be None for the
+        day's own input) in worker processes, 'jobs' at a time, and returns
+        the results in the order of 'parts'.
+
+        'timeouts' and 'max_rss' map (day, part), (day, None) or (None, None)
+        to a budget of seconds of wall time, respectively MiB of RSS. A part
+        running out of time is stopped by its worker; a watchdog kills the
+        workers going past their RSS budget, or not stopping in time, and
+        reports those parts as such. The other parts run to completion."""
+    import multiprocessing
+    from multiprocessing.connection import wait
+
+    jobs = jobs or os.cpu_count() or 1
+    timeouts, max_rss = timeouts or {}, max_rss or {}
+
+    pending = list(reversed(parts))
+    running = {} # connection -> (process, task, start, timeout, max_rss_kb)
+    results = {}
+    while pending or running:
+        while pending and len(running) < jobs:
+            # one process per part, so the peak RSS is that of the part alone
+            day, part, path = task = pending.pop()
+            timeout = budget_for(timeouts, day, part)
+            rss_budget = budget_for(max_rss, day, part)
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=_run_part_in_child,
+                args=(sender, (day, part, path, repeat, timeout, profile,
+                               profile_dir)),
+                daemon=True)
+            process.start()
+            sender.close()
+            running[receiver] = (process, task, time.perf_counter(), timeout,
+                                 rss_budget and rss_budget * 1024)
+
+        for conn in wait(list(running), timeout=WATCH_INTERVAL):
+            process, (day, part, path) = running.pop(conn)[:2]
+            try:
+                results[day, part, path] = conn.recv()
+            except EOFError:
+                results[day, part, path] = stopped_result(
+                    day, part, path, repeat, "error",
+                    f"worker exited with code {process.exitcode}", None)
+            conn.close()
+            process.join()
+
+        for conn, (process, task, start, timeout, rss_budget) in \
+                list(running.items()):
+            rss = current_rss_kb(process.pid)
+            if rss_budget and rss and rss > rss_budget:
+                status = "memory"
+                error = f"killed at {rss / 1024:.1f} MiB of RSS, over the " \
+                        f"{rss_budget / 1024:g} MiB budget"
+            elif timeout and \
+                    time.perf_counter() - start > timeout + KILL_GRACE:
+                status, error = "timeout", f"killed after {timeout:g} s"
+            else:
+                continue
+
+            process.kill()
+            process.join()
+            conn.close()
+            del running[conn]
+            results[task] = stopped_result(*task, repeat, status, error, rss)
+
+    return [results[p] for p in parts]
+
+def parse_budgets(values):
+    """Maps the '--timeout' / '--max-rss' values, either 'N' (any part),
+        'DAY=N' or 'DAY.PART=N', to a budgets dict for 'run_parts'."""
+    budgets = {}
+    for value in values or ():
+        key, _, amount = value.rpartition("=")
+        day, _, part = key.partition(".")
+        budgets[int(day) if day else None, part or None] = float(amount)
+
+    return budgets
+
+def format_seconds(seconds):
+    return "-" if seconds is None else f"{seconds:.3f}"
+
+def format_report(results, total_wall):
+    lines = [f"{'day':>3} {'part':>4}  {'answer':<34} {'wall s':>8} "
+             f"{'cpu s':>8} {'rss MiB':>8}"]
+    for r in results:
+        answer = r["answer"] if r["error"] is None else f"ERROR {r['error']}"
+        lines.append(f"{r['day']:>3} {r['part']:>4}  {str(answer)[:34]:<34} "
+                     f"{format_seconds(r['wall']):>8} "
+                     f"{format_seconds(r['cpu']):>8} "
+                     f"{r['peak_rss_kb'] / 1024:>8.1f}")
+
+    cpu_total = sum(r["cpu"] or 0 for r in results)
+    lines.append(f"{len(results)} parts, {total_wall:.3f} s wall, "
+                 f"{cpu_total:.3f} s cpu")
+    return "\n".join(lines)
+
+def format_json(results, total_wall):
+    report = dict(python=platform.python_version(),
+                  machine=platform.machine(), cpus=os.cpu_count(),
+                  total_wall=total_wall, results=results)
+    # answers that are not JSON types (e.g. tuples of coordinates) as text
+    return json.dumps(report, indent=2, default=str)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("days", nargs="*", type=int)
+    parser.add_argument("-p", "--parts", nargs="+", choices=PARTS,
+                        default=PARTS)
+    parser.add_argument("-i", "--input", dest="inputs", action="append",
+                        help="solve on this input file instead of the day's "
+                             "own (may be repeated)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="solve each part this many times")
+    parser.add_argument("--timeout", action="append",
+                        metavar="[DAY[.PART]=]S",
+                        help="seconds of wall time allowed per part, for all "
+                             "parts or the given ones (may be repeated)")
+    parser.add_argument("--max-rss", action="append",
+                        metavar="[DAY[.PART]=]MIB",
+                        help="RSS allowed per part, in MiB (same syntax)")
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    parser.add_argument("--profile", choices=PROFILE_MODES,
+                        help="profile every part, see profiling.py")
+    parser.add_argument("--profile-dir", default=None,
+                        help="folder of the profile reports")
+    args = parser.parse_args(argv)
+
+    parts = [(day, part, path)
+             for day, part in discover_parts(args.days or discover_days())
+             if part in args.parts
+             for path in args.inputs or [None]]
+
+    start = time.perf_counter()
+    results = run_parts(parts, args.jobs, args.repeat,
+                        parse_budgets(args.timeout),
+                        parse_budgets(args.max_rss),
+                        args.profile, args.profile_dir)
+    formatter = format_json if args.format == "json" else format_report
+    print(formatter(results, time.perf_counter() - start))
+
+    return 1 if any(r["error"] for r in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
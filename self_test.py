@@ -0,0 +1,35 @@
+# self_test.py
+
+"""
+Runs the example-based self-tests registered by the day modules.
+
+    python self_test.py              # all days, fast tests only
+    python self_test.py 10 14 -p b   # part b of days 10 and 14
+    python self_test.py --slow       # include the long-running examples
+"""
+
+import argparse
+import sys
+
+from utils import DAYS, PARTS, run_self_tests
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("days", nargs="*", type=int, default=list(DAYS))
+    parser.add_argument("-p", "--parts", nargs="+", choices=PARTS,
+                        default=list(PARTS))
+    parser.add_argument("--slow", action="store_true",
+                        help="also run the long-running examples")
+    args = parser.parse_args(argv)
+
+    results = run_self_tests(args.days, args.parts, include_slow=args.slow)
+
+    failures = [r for r in results if r[3] is not None]
+    for day, part, name, error in failures:
+        print(f"FAIL day {day:2d} {part or '-'} {name}: {error!r}")
+
+    print(f"{len(results) - len(failures)} passed, {len(failures)} failed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
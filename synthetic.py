@@ -0,0 +1,499 @@
+# synthetic.py
+
+"""
+Generators of valid puzzle inputs of a configurable size, to see how the
+solvers scale past the size of the inputs in 'data/'.
+
+    generate(day, size, seed=2017) -> input text
+
+'size' is the natural scale of each day (digits for day 1, rows for day 2,
+programs for day 7, nodes for day 12, particles for day 20, ...), see the
+docstring of each generator. The same (day, size, seed) always gives the same
+input. A few solvers hard-code their workload (the pairs of day 15, the
+insertions of day 17, the bursts of day 22, the steps of day 25), so their
+inputs only scale what they can.
+
+    python synthetic.py 12 100000 > /tmp/day_12.txt
+"""
+
+import itertools
+import random
+import string
+import sys
+
+# day -> function(size, rng) returning the input text
+GENERATORS = {}
+
+def generator(day):
+    """Register the decorated function as the input generator of 'day'."""
+    def register(func):
+        GENERATORS[day] = func
+        return func
+
+    return register
+
+def generate(day, size, seed=2017, **params):
+    """A valid input of the given size for 'day'; 'params' are passed to its
+    generator (e.g. width=5000 for day 2's rows)."""
+    if day not in GENERATORS:
+        raise LookupError(f"no input generator for day {day}")
+
+    return GENERATORS[day](size, random.Random(f"{day}-{size}-{seed}"),
+                           **params)
+
+def random_name(rng, used, length=6):
+    """A random lowercase name not in 'used' (which it is added to)."""
+    while True:
+        name = "".join(rng.choices(string.ascii_lowercase, k=length))
+        if name not in used:
+            used.add(name)
+            return name
+
+def primes_in(lo, hi):
+    sieve = bytearray([1]) * hi
+    sieve[:2] = b"\x00\x00"
+    for i in range(2, int(hi ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i*i::i] = bytearray(len(range(i*i, hi, i)))
+
+    return [i for i in range(lo, hi) if sieve[i]]
+
+@generator(1)
+def day_01(size, rng):
+    """'size' digits (rounded up to an even count, as part b requires)."""
+    size += size % 2
+    return "".join(rng.choices(string.digits, k=size))
+
+@generator(2)
+def day_02(size, rng, width=16):
+    """'size' rows of 'width' cells. Cells are distinct primes plus a single
+    multiple of one of them, so each row has exactly one divisible pair."""
+    primes = primes_in(1000, max(2000, 1000 + 20 * width))
+    rows = []
+    for _ in range(size):
+        row = rng.sample(primes, width - 1)
+        row.append(rng.choice(row) * rng.randint(2, 9))
+        rng.shuffle(row)
+        rows.append("\t".join(map(str, row)))
+
+    return "\n".join(rows)
+
+@generator(3)
+def day_03(size, rng):
+    """The square number 'size' itself."""
+    return str(size)
+
+@generator(4)
+def day_04(size, rng):
+    """'size' passphrases of 5 to 10 words."""
+    lines = []
+    for _ in range(size):
+        words = ["".join(rng.choices("abcdef", k=rng.randint(2, 4)))
+                 for _ in range(rng.randint(5, 10))]
+        lines.append(" ".join(words))
+
+    return "\n".join(lines)
+
+@generator(5)
+def day_05(size, rng):
+    """'size' offsets; like the real inputs, offset i jumps back at most i
+    positions (or forward by at most 2), so the maze is always exited."""
+    return "\n".join(str(rng.randint(-i, 2)) for i in range(size))
+
+@generator(6)
+def day_06(size, rng, max_blocks=15):
+    """'size' memory banks of 0 to 'max_blocks' blocks. More banks and more
+    blocks make longer reallocation cycles."""
+    return "\t".join(str(rng.randint(0, max_blocks)) for _ in range(size))
+
+@generator(7)
+def day_07(size, rng):
+    """A tower of about 'size' programs (at least 13). Every program holding
+    a disc has 3 to 5 identical sub-towers, then one program holding a disc
+    (as in the real inputs) gets a wrong weight."""
+    branching = []
+    nr_programs, level_size = 1, 1
+    while nr_programs < size or len(branching) < 2:
+        branching.append(rng.randint(3, 5))
+        level_size *= branching[-1]
+        nr_programs += level_size
+    level_weights = [rng.randint(10, 99) for _ in range(len(branching) + 1)]
+
+    used = set()
+    programs = [] # (name, weight, children names)
+
+    def build(level):
+        name = random_name(rng, used)
+        children = []
+        if level < len(branching):
+            children = [build(level + 1) for _ in range(branching[level])]
+        programs.append([name, level_weights[level], children])
+        return name
+
+    build(0)
+    # the root is the last program built
+    wrong = rng.choice([p for p in programs[:-1] if p[2]])
+    wrong[1] += rng.choice([-1, 1]) * rng.randint(1, 9)
+
+    rng.shuffle(programs)
+    lines = []
+    for name, weight, children in programs:
+        line = f"{name} ({weight})"
+        if children:
+            line += " -> " + ", ".join(children)
+        lines.append(line)
+
+    return "\n".join(lines)
+
+@generator(8)
+def day_08(size, rng):
+    """'size' instructions over 26 registers."""
+    registers = [random_name(rng, set(), 3) for _ in range(26)]
+    ops = ["<", "<=", ">", ">=", "==", "!="]
+    lines = []
+    for _ in range(size):
+        lines.append(f"{rng.choice(registers)} {rng.choice(['inc', 'dec'])} "
+                     f"{rng.randint(-1000, 1000)} if {rng.choice(registers)} "
+                     f"{rng.choice(ops)} {rng.randint(-1000, 1000)}")
+
+    return "\n".join(lines)
+
+@generator(9)
+def day_09(size, rng):
+    """A stream of about 'size' characters: nested groups and garbage, with
+    canceled characters."""
+    garbage_chars = string.ascii_lowercase + "{}<,'\""
+    out = ["{"]
+    length, depth = 1, 1
+    first_in_group = [True]
+
+    while length < size or depth > 0:
+        closing = length >= size or (depth > 1 and rng.random() < 0.3)
+        if closing:
+            out.append("}")
+            length += 1
+            depth -= 1
+            first_in_group.pop()
+            continue
+
+        if not first_in_group[-1]:
+            out.append(",")
+            length += 1
+        first_in_group[-1] = False
+
+        if depth < 20 and rng.random() < 0.5:
+            out.append("{")
+            length += 1
+            depth += 1
+            first_in_group.append(True)
+        else:
+            garbage = ["<"]
+            for _ in range(rng.randint(0, 12)):
+                if rng.random() < 0.15:
+                    garbage.append("!" + rng.choice(garbage_chars + "!>"))
+                else:
+                    garbage.append(rng.choice(garbage_chars))
+            garbage.append(">")
+            out.extend(garbage)
+            length += sum(map(len, garbage))
+
+    return "".join(out)
+
+@generator(10)
+def day_10(size, rng):
+    """'size' lengths between 0 and 255."""
+    return ",".join(str(rng.randint(0, 255)) for _ in range(size))
+
+@generator(11)
+def day_11(size, rng):
+    """'size' steps."""
+    return ",".join(rng.choices(["n", "ne", "se", "s", "sw", "nw"], k=size))
+
+@generator(12)
+def day_12(size, rng):
+    """'size' programs with about 1.5 pipes each (so there are many groups)."""
+    neighbors = [set() for _ in range(size)]
+    for _ in range(size * 3 // 4):
+        a, b = rng.randrange(size), rng.randrange(size)
+        neighbors[a].add(b)
+        neighbors[b].add(a)
+
+    lines = []
+    for node, ns in enumerate(neighbors):
+        ns = sorted(ns) or [node]
+        lines.append(f"{node} <-> {', '.join(map(str, ns))}")
+
+    return "\n".join(lines)
+
+@generator(13)
+def day_13(size, rng):
+    """'size' layers, about two thirds of them with a scanner. Ranges are
+    picked so that some delay below 10 * 'size' gets through."""
+    safe_delay = rng.randrange(10 * size)
+    lines = []
+    for depth in range(size):
+        if depth > 0 and rng.random() < 1 / 3:
+            continue
+        while True:
+            scanner_range = rng.randint(2, 20)
+            if (depth + safe_delay) % (2 * (scanner_range - 1)) != 0:
+                break
+        lines.append(f"{depth}: {scanner_range}")
+
+    return "\n".join(lines)
+
+@generator(14)
+def day_14(size, rng):
+    """A key of 'size' letters (the disk is always 128x128)."""
+    return "".join(rng.choices(string.ascii_lowercase, k=size))
+
+@generator(15)
+def day_15(size, rng):
+    """Random starting values ('size' is ignored, the pair counts are fixed)."""
+    return (f"Generator A starts with {rng.randint(1, 2147483646)}\n"
+            f"Generator B starts with {rng.randint(1, 2147483646)}")
+
+@generator(16)
+def day_16(size, rng):
+    """'size' dance moves for 16 programs."""
+    programs = string.ascii_lowercase[:16]
+    moves = []
+    for _ in range(size):
+        kind = rng.choice("sxp")
+        if kind == "s":
+            moves.append(f"s{rng.randint(1, 15)}")
+        elif kind == "x":
+            a, b = rng.sample(range(16), 2)
+            moves.append(f"x{a}/{b}")
+        else:
+            a, b = rng.sample(programs, 2)
+            moves.append(f"p{a}/{b}")
+
+    return ",".join(moves)
+
+@generator(17)
+def day_17(size, rng):
+    """The step count, 'size' itself (the insertion counts are fixed)."""
+    return str(size)
+
+DAY_18_PROGRAM = """\
+set i 31
+set a 1
+mul p 17
+jgz p p
+mul a 2
+add i -1
+jgz i -2
+add a -1
+set i {count}
+set p {seed}
+mul p 8505
+mod p a
+mul p 129749
+add p 12345
+mod p a
+set b p
+mod b 10000
+snd b
+add i -1
+jgz i -9
+jgz a 3
+rcv b
+jgz b -1
+set f 0
+set i {count_minus_1}
+rcv a
+rcv b
+set p a
+mul p -1
+add p b
+jgz p 4
+snd a
+set a b
+jgz 1 3
+snd b
+set f 1
+add i -1
+jgz i -11
+snd a
+jgz f -16
+jgz a -19"""
+
+@generator(18)
+def day_18(size, rng):
+    """The real inputs' program (the two copies bubble sort pseudo-random
+    numbers between them), sorting 'size' numbers (at least 2)."""
+    size = max(size, 2)
+    return DAY_18_PROGRAM.format(count=size, count_minus_1=size - 1,
+                                 seed=rng.randint(1, 999))
+
+@generator(19)
+def day_19(size, rng, height=40):
+    """A routing diagram snaking through 'size' columns of 'height' rows,
+    with letters along the way and at its end."""
+    size = max(size, 1)
+    grid = [[" "] * (3 * size + 1) for _ in range(height + 2)]
+    path = []
+
+    def draw(x, y, c):
+        grid[y][x] = c
+        path.append((x, y))
+
+    x, y = 1, 0
+    for column in range(size):
+        step = 1 if column % 2 == 0 else -1
+        end = height if step == 1 else 1
+        last = column == size - 1
+        if last:
+            end = (y + end) // 2
+        for y in range(y, end + step, step):
+            draw(x, y, "|")
+        if last:
+            break
+
+        grid[y][x] = "+"
+        draw(x + 1, y, "-")
+        draw(x + 2, y, "-")
+        x += 3
+        draw(x, y, "+")
+        y -= step
+
+    for x, y in path[1:-1]:
+        if grid[y][x] != "+" and rng.random() < 0.05:
+            grid[y][x] = rng.choice(string.ascii_uppercase)
+    x, y = path[-1]
+    grid[y][x] = rng.choice(string.ascii_uppercase)
+
+    return "\n".join("".join(row) for row in grid)
+
+@generator(20)
+def day_20(size, rng):
+    """'size' particles."""
+    lines = []
+    for _ in range(size):
+        p = [rng.randint(-3000, 3000) for _ in range(3)]
+        v = [rng.randint(-100, 100) for _ in range(3)]
+        a = [rng.randint(-10, 10) for _ in range(3)]
+        lines.append("p=<{},{},{}>, v=<{},{},{}>, a=<{},{},{}>"
+                     .format(*p, *v, *a))
+
+    return "\n".join(lines)
+
+def pattern_classes(n):
+    """One representative per rotation / flip class of n x n patterns."""
+    def rotate(rows):
+        return tuple(zip(*reversed(rows)))
+
+    def flip(rows):
+        return tuple(tuple(reversed(row)) for row in rows)
+
+    seen = set()
+    representatives = []
+    for cells in itertools.product(".#", repeat=n * n):
+        rows = tuple(tuple(cells[i*n:(i+1)*n]) for i in range(n))
+        if rows in seen:
+            continue
+
+        representatives.append(rows)
+        for _ in range(4):
+            seen.add(rows)
+            seen.add(flip(rows))
+            rows = rotate(rows)
+
+    return representatives
+
+@generator(21)
+def day_21(size, rng):
+    """A complete rule book ('size' is ignored, the iteration counts are
+    fixed): one rule per 2x2 and 3x3 pattern class."""
+    def text(rows):
+        return "/".join("".join(row) for row in rows)
+
+    def random_pattern(n):
+        return "/".join("".join(rng.choices(".#", k=n)) for _ in range(n))
+
+    lines = [f"{text(p)} => {random_pattern(3)}" for p in pattern_classes(2)]
+    lines += [f"{text(p)} => {random_pattern(4)}" for p in pattern_classes(3)]
+    return "\n".join(lines)
+
+@generator(22)
+def day_22(size, rng):
+    """A 'size' x 'size' grid (rounded up to odd), half of it infected."""
+    size += 1 - size % 2
+    return "\n".join("".join(rng.choices(".#", k=size)) for _ in range(size))
+
+DAY_23_PROGRAM = """\
+set b {b}
+set c b
+jnz a 2
+jnz 1 5
+mul b 100
+sub b -100000
+set c b
+sub c -17000
+set f 1
+set d 2
+set e 2
+set g d
+mul g e
+sub g b
+jnz g 2
+set f 0
+sub e -1
+set g e
+sub g b
+jnz g -8
+sub d -1
+set g d
+sub g b
+jnz g -13
+jnz f 2
+sub h -1
+set g b
+sub g c
+jnz g 2
+jnz 1 3
+sub b -17
+jnz 1 -23"""
+
+@generator(23)
+def day_23(size, rng):
+    """The real inputs' program with b = 'size' (at least 3); part a runs
+    (b - 2)^2 multiplications."""
+    return DAY_23_PROGRAM.format(b=max(size, 3))
+
+@generator(24)
+def day_24(size, rng):
+    """'size' components with ports between 0 and 50 (or more, when there are
+    not enough distinct components), a few of them fitting the 0 port."""
+    max_port = max(50, 2 * int(size ** 0.5))
+    tubes = {(0, rng.randint(1, max_port)) for _ in range(size // 20 + 2)}
+    while len(tubes) < size:
+        tubes.add(tuple(sorted((rng.randint(0, max_port),
+                                rng.randint(0, max_port)))))
+
+    tubes = list(tubes)
+    rng.shuffle(tubes)
+    return "\n".join(f"{a}/{b}" for a, b in tubes)
+
+@generator(25)
+def day_25(size, rng, nr_states=6):
+    """A Turing machine blueprint running 'size' steps."""
+    states = string.ascii_uppercase[:nr_states]
+    lines = [f"Begin in state {states[0]}.",
+             f"Perform a diagnostic checksum after {size} steps."]
+    for state in states:
+        lines += ["", f"In state {state}:"]
+        for value in (0, 1):
+            lines += [f"  If the current value is {value}:",
+                      f"    - Write the value {rng.randint(0, 1)}.",
+                      f"    - Move one slot to the "
+                      f"{rng.choice(['left', 'right'])}.",
+                      f"    - Continue with state {rng.choice(states)}."]
+
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    day, size = map(int, sys.argv[1:3])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 2017
+    print(generate(day, size, seed))
@@ -1,17 +1,172 @@
 # utils.py
 
+import functools
+import importlib
+
 DATA_FOLDER = "./data"
+DAYS = range(1, 26)
+PARTS = ("a", "b")
+CHUNK_SIZE = 1 << 20
+
+# (day, part) -> list of (test function, slow flag)
+SELF_TESTS = {}
+
+def day_str(day: int) -> str:
+    """Zero-padded day number, as used in file and folder names."""
+    return f"{day:02d}"
+
+def input_path(day: int) -> str:
+    return f"{DATA_FOLDER}/day_{day_str(day)}/input"
 
 def read_input_data(day: int) -> str:
-    """Read this day's input file."""
-    if day < 10:
-        day_str = f"0{day}"
-    else:
-        day_str = f"{day}"
+    """Read this day's input file, without its trailing newlines."""
+    with open(input_path(day), 'r') as f:
+        return f.read().rstrip("\n")
+
+def iter_lines(path):
+    """Lazily yields the lines of a file, without line endings or trailing
+        empty lines (like read_input_data(...).split("\n") would)."""
+    nr_empty = 0
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line:
+                nr_empty += 1
+                continue
+
+            for _ in range(nr_empty):
+                yield ""
+            nr_empty = 0
+            yield line
+
+def iter_chunks(path, size=CHUNK_SIZE):
+    """Lazily yields a file's text in chunks of about 'size' characters,
+        without its trailing newlines."""
+    pending = ""
+    with open(path, 'r') as f:
+        while True:
+            chunk = f.read(size)
+            if not chunk:
+                return
+
+            # newlines are held back until we know they are not trailing
+            chunk = pending + chunk
+            stripped = chunk.rstrip("\n")
+            pending = chunk[len(stripped):]
+            if stripped:
+                yield stripped
+
+def byte_ranges(path, nr_ranges):
+    """Splits a file, without its trailing newlines, in at most 'nr_ranges'
+        (start, end) byte ranges of about the same size, to be read in
+        parallel with 'iter_range_lines'."""
+    with open(path, 'rb') as f:
+        size = f.seek(0, 2)
+        while size > 0:
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                break
+            size -= 1
+
+    step = max(1, -(-size // nr_ranges))
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+def iter_range_lines(path, start, end):
+    """Lazily yields the lines of a file starting in the byte range [start,
+        end), without line endings: the ranges of 'byte_ranges' split the
+        file's lines between them."""
+    with open(path, 'rb') as f:
+        if start > 0:
+            # skip the rest of a line started before the range
+            f.seek(start - 1)
+            f.readline()
+
+        while f.tell() < end:
+            yield f.readline().rstrip(b"\n").decode()
+
+def iter_separated(chunks, sep=","):
+    """Yields the 'sep'-separated tokens of a stream of text chunks."""
+    partial = ""
+    for chunk in chunks:
+        tokens = (partial + chunk).split(sep)
+        partial = tokens.pop()
+        yield from tokens
+
+    yield partial
+
+def load_day(day: int):
+    """Import (once) and return the module solving this day."""
+    return importlib.import_module(f"day_{day_str(day)}")
+
+def get_solver(day: int, part: str):
+    """This day's 'solve_challenge_<part>' function, or None if missing."""
+    return getattr(load_day(day), f"solve_challenge_{part}", None)
 
-    input_data_path = f"{DATA_FOLDER}/day_{day_str}/input"
-    with open(input_data_path, 'r') as f:
-        return f.read()
+def lazy_jit(func):
+    """Compiles 'func' with numba's jit on its first call, so that numba is
+    only imported by the code paths using it. Without numba, 'func' runs as
+    plain Python."""
+    compiled = None
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal compiled
+        if compiled is None:
+            try:
+                from numba import jit
+                compiled = jit(func)
+            except ImportError:
+                compiled = func
+
+        return compiled(*args, **kwargs)
+
+    return wrapper
+
+@functools.lru_cache(maxsize=None)
+def optional_module(name):
+    """The module 'name', imported on first use, or None when it is not
+    installed; for optional accelerations (e.g. numpy) that should neither
+    be required nor slow down importing the day modules."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+def self_test(day, part, slow=False):
+    """Register the decorated function as a self-test of a day's part.
+
+    Tests are only run on demand (see 'run_self_tests'), so importing a day
+    module does not pay for its examples."""
+    def register(test):
+        SELF_TESTS.setdefault((day, part), []).append((test, slow))
+        return test
+
+    return register
+
+def run_self_tests(days=DAYS, parts=PARTS, include_slow=False):
+    """Runs the registered self-tests, returns a list of
+        (day, part, test name, error or None) tuples."""
+    results = []
+    for day in days:
+        try:
+            load_day(day)
+        except Exception as e:
+            results.append((day, None, "import", e))
+            continue
+
+        for part in parts:
+            for test, slow in SELF_TESTS.get((day, part), []):
+                if slow and not include_slow:
+                    continue
+
+                try:
+                    test()
+                    error = None
+                except Exception as e:
+                    error = e
+                results.append((day, part, test.__name__, error))
+
+    return results
 
 def count_from(i):
     while True:
@@ -27,11 +182,29 @@ def chunks_of(lst, n):
 
     return map(list, zip(*[iter(lst)]*n))
 
-def puzzle_a(day, solve_challenge_a):
+def solve_puzzle(day, part, solver, cache_mode=None, profile=None):
+    """Solves a part on this day's input, through the answer store (see
+        'cache.solve_cached' for 'cache_mode'). With a 'profile' mode (see
+        'profiling', default: from AOC_PROFILE) the solver always runs, under
+        the profiler."""
+    # deferred to keep day imports cheap
+    from cache import solve_cached
+    from profiling import PROFILE_MODE, profile_call
+
     data = read_input_data(day)
-    print(solve_challenge_a(data))
+    profile = profile or PROFILE_MODE
+    if profile:
+        name = f"day_{day_str(day)}{part}"
+        profiled = lambda data: profile_call(profile, solver, data, name=name)
+        return solve_cached(day, part, solver, data, "refresh",
+                            run=profiled)
 
+    return solve_cached(day, part, solver, data, cache_mode)
+
+def puzzle_a(day, solve_challenge_a, cache_mode=None, profile=None):
+    print(solve_puzzle(day, "a", solve_challenge_a, cache_mode, profile))
+
+
+def puzzle_b(day, solve_challenge_b, cache_mode=None, profile=None):
+    print(solve_puzzle(day, "b", solve_challenge_b, cache_mode, profile))
 
-def puzzle_b(day, solve_challenge_b):
-    data = read_input_data(day)
-    print(solve_challenge_b(data))
\ No newline at end of file